@@ -1,8 +1,17 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 app = Celery('backend')
 app.config_from_object('django.conf:settings', namespace='CELERY')
-app.autodiscover_tasks()
\ No newline at end of file
+app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def load_embedding_model(**kwargs):
+    # Load the embedding model once per worker process instead of once per task
+    if os.getenv("PRELOAD_EMBEDDING_MODEL", "1") != "0":
+        from job.embeddings import get_embedding_model
+        get_embedding_model()
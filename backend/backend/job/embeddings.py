@@ -0,0 +1,239 @@
+import hashlib
+import os
+import threading
+import time
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import VectorParams, Distance, PointStruct, PointIdsList, PayloadSchemaType
+
+from .models import Job
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384  # 384 for MiniLM
+
+# CPU inference backend: "torch" (default), "torch-int8" (dynamic int8 quantization),
+# "onnx" or "onnx-int8" (ONNX Runtime; needs `pip install optimum[onnxruntime]`)
+EMBEDDING_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# Pre-quantized ONNX export shipped with the model on the Hugging Face hub
+ONNX_INT8_FILE = os.getenv("EMBEDDING_ONNX_INT8_FILE", "onnx/model_quint8_avx2.onnx")
+
+def embedding_model_version(backend=EMBEDDING_BACKEND):
+    """
+    Identifier stored in Job.embedding_model. Vectors from different backends differ
+    slightly, so switching backend re-embeds every job once.
+    """
+    return EMBEDDING_MODEL_NAME if backend == "torch" else f"{EMBEDDING_MODEL_NAME}+{backend}"
+COLLECTION_NAME = "jobs"
+QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
+QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+
+# Job fields copied into each point's payload so searches can filter in Qdrant.
+# Everything else is read from the Job table by id.
+PAYLOAD_FIELDS = {
+    "source": PayloadSchemaType.KEYWORD,
+    "category": PayloadSchemaType.KEYWORD,
+    "is_remote": PayloadSchemaType.BOOL,
+    "country": PayloadSchemaType.KEYWORD,
+    "city": PayloadSchemaType.KEYWORD,
+    "job_type": PayloadSchemaType.KEYWORD,
+    "experience_level": PayloadSchemaType.KEYWORD,
+}
+# Fields needed to build a job's embedding text and Qdrant payload
+EMBEDDING_FIELDS = ("id", "title", "company", "description", "skills", "tags", "embedding_hash", "embedding_model", *PAYLOAD_FIELDS)
+# Jobs encoded as one matrix per batch
+EMBED_BATCH_SIZE = 64
+# Points sent per Qdrant upsert request, and attempts per request before giving up
+QDRANT_UPSERT_BATCH_SIZE = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256"))
+QDRANT_UPSERT_RETRIES = 3
+# Rows read from the Job table per query while scanning for changed jobs
+SCAN_CHUNK_SIZE = 1000
+
+_model = None
+_model_lock = threading.Lock()
+
+def load_embedding_model(backend=EMBEDDING_BACKEND):
+    """
+    Loads a fresh copy of the embedding model on the given CPU backend.
+    """
+    from sentence_transformers import SentenceTransformer
+    if backend == "torch":
+        return SentenceTransformer(EMBEDDING_MODEL_NAME)
+    if backend == "torch-int8":
+        import torch
+        model = SentenceTransformer(EMBEDDING_MODEL_NAME, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if backend == "onnx":
+        return SentenceTransformer(EMBEDDING_MODEL_NAME, backend="onnx")
+    if backend == "onnx-int8":
+        return SentenceTransformer(EMBEDDING_MODEL_NAME, backend="onnx", model_kwargs={"file_name": ONNX_INT8_FILE})
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+def get_embedding_model():
+    """
+    Returns the process-wide embedding model, loading the weights on first use.
+    Celery workers preload it at process start (see backend/celery.py), so tasks and
+    views share one copy per process instead of loading it on every call.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                print(f"Loading embedding model {EMBEDDING_MODEL_NAME} ({EMBEDDING_BACKEND})...")
+                _model = load_embedding_model(EMBEDDING_BACKEND)
+    return _model
+
+def encode_texts(texts, batch_size=None):
+    """
+    Encodes a list of texts with the shared model and returns a numpy matrix, one row per text.
+    """
+    return get_embedding_model().encode(texts, batch_size=batch_size or EMBED_BATCH_SIZE, convert_to_numpy=True)
+
+def _as_list(value):
+    # Ensure tags and skills are lists (not QuerySets or None)
+    return list(value) if value and not isinstance(value, list) else (value or [])
+
+def job_embedding_text(job):
+    return f"{job.title or ''} {job.company or ''} {job.description or ''} {_as_list(job.skills)} {_as_list(job.tags)}"
+
+def embedding_text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def job_payload(job):
+    payload = {"job_id": job.id}
+    for field in PAYLOAD_FIELDS:
+        payload[field] = getattr(job, field)
+    return payload
+
+def get_qdrant_client():
+    return QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+
+def ensure_collection(qdrant, collection_name=COLLECTION_NAME):
+    """
+    Creates the collection if it is missing and makes sure every PAYLOAD_FIELDS entry
+    is indexed. Index creation is idempotent, so collections created before the
+    payload indexes existed get them on the next embed run.
+    """
+    collections = [c.name for c in qdrant.get_collections().collections]
+    if collection_name not in collections:
+        print(f"Collection '{collection_name}' does not exist. Creating...")
+        qdrant.recreate_collection(
+            collection_name=collection_name,
+            vectors_config=VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE)
+        )
+        print(f"Collection '{collection_name}' created.")
+    for field, schema in PAYLOAD_FIELDS.items():
+        qdrant.create_payload_index(collection_name=collection_name, field_name=field, field_schema=schema)
+
+def nearest_jobs(text, limit, collection_name=COLLECTION_NAME):
+    """
+    Encodes `text` once and returns the `limit` nearest job points in Qdrant as
+    [(job_id, cosine_score)], best first. The collection is created by embed_jobs;
+    querying before it exists raises.
+    """
+    vector = encode_texts([text])[0]
+    qdrant = get_qdrant_client()
+    hits = qdrant.query_points(
+        collection_name=collection_name,
+        query=vector.tolist(),
+        limit=limit,
+        with_payload=False,
+    ).points
+    return [(hit.id, hit.score) for hit in hits]
+
+def upsert_points(qdrant, collection_name, points, batch_size=QDRANT_UPSERT_BATCH_SIZE, retries=QDRANT_UPSERT_RETRIES):
+    """
+    Upserts points in requests of at most `batch_size`, retrying each request with
+    exponential backoff so a transient Qdrant error doesn't abort a long backfill.
+    """
+    for start in range(0, len(points), batch_size):
+        chunk = points[start:start + batch_size]
+        for attempt in range(retries):
+            try:
+                qdrant.upsert(collection_name=collection_name, points=chunk, wait=True)
+                break
+            except Exception as e:
+                if attempt == retries - 1:
+                    raise
+                delay = 2 ** attempt
+                print(f"Qdrant upsert of {len(chunk)} points failed ({e}), retrying in {delay}s...")
+                time.sleep(delay)
+
+def delete_job_points(qdrant, job_ids, collection_name=COLLECTION_NAME, batch_size=QDRANT_UPSERT_BATCH_SIZE):
+    """
+    Deletes the points of the given jobs from Qdrant, `batch_size` ids per request.
+    Ids without a point are ignored. Returns the number of ids sent.
+    """
+    if not qdrant.collection_exists(collection_name):
+        return 0
+    job_ids = [int(job_id) for job_id in job_ids]
+    for start in range(0, len(job_ids), batch_size):
+        chunk = job_ids[start:start + batch_size]
+        qdrant.delete(collection_name=collection_name, points_selector=PointIdsList(points=chunk), wait=True)
+    return len(job_ids)
+
+def jobs_needing_embedding(model_version=None):
+    """
+    Yields (job, text, text_hash) for jobs that were never embedded, were embedded with
+    another model version, or whose embedding text changed since.
+    """
+    model_version = model_version or embedding_model_version()
+    # Walk the table in id order, one bounded query at a time, so rows can be
+    # updated between chunks without holding a cursor open on SQLite
+    last_id = 0
+    while True:
+        chunk = list(Job.objects.only(*EMBEDDING_FIELDS).filter(id__gt=last_id).order_by("id")[:SCAN_CHUNK_SIZE])
+        if not chunk:
+            return
+        last_id = chunk[-1].id
+        for job in chunk:
+            text = job_embedding_text(job)
+            text_hash = embedding_text_hash(text)
+            if job.embedding_hash != text_hash or job.embedding_model != model_version:
+                yield job, text, text_hash
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def embed_jobs(collection_name=COLLECTION_NAME, batch_size=EMBED_BATCH_SIZE):
+    """
+    Encodes only new or changed jobs and upserts their vectors to Qdrant, then records
+    the text hash and model on each job so the next run can skip it.
+    Jobs are streamed in batches of `batch_size`: each batch is encoded as a single
+    matrix and upserted in bounded chunks, so memory stays bounded by the batch size.
+    Payloads hold only the job id and filter fields; the full record stays in the Job table.
+    Returns the number of jobs embedded.
+    """
+    print("Connecting to Qdrant...")
+    qdrant = get_qdrant_client()
+    ensure_collection(qdrant, collection_name)
+
+    model_version = embedding_model_version()
+    embedded = 0
+    for batch in _batched(jobs_needing_embedding(), batch_size):
+        vectors = encode_texts([text for _, text, _ in batch], batch_size=batch_size)
+        points = []
+        for (job, _, text_hash), vector in zip(batch, vectors):
+            points.append(PointStruct(
+                id=int(job.id),  # Use integer ID for Qdrant
+                vector=vector.tolist(),
+                payload=job_payload(job),
+            ))
+            job.embedding_hash = text_hash
+            job.embedding_model = model_version
+
+        # A failed upsert raises before the hashes are saved, so the batch is retried next run
+        upsert_points(qdrant, collection_name, points)
+        Job.objects.bulk_update([job for job, _, _ in batch], ["embedding_hash", "embedding_model"])
+        embedded += len(batch)
+        print(f"Embedded {embedded} jobs...")
+
+    print(f"Embedding complete: {embedded} jobs upserted to '{collection_name}'.")
+    return embedded
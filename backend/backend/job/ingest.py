@@ -0,0 +1,169 @@
+from urllib.parse import urlsplit
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from scrapers.main_scraper import hiring_cafe_job_link
+from .models import Job
+from .normalize import parse_date, parse_salary
+
+# Rows per INSERT statement when bulk creating jobs
+BULK_CREATE_BATCH_SIZE = 500
+
+# Fields filled from structured job data; an upsert overwrites exactly these
+INGEST_FIELDS = [
+    "title", "company", "description", "gender", "agemax", "agemin", "other_requirements",
+    "skills", "is_online", "is_remote", "location", "country", "city", "address", "salary",
+    "salary_min", "salary_max", "deadline", "job_type", "category", "posted_date",
+    "experience_level", "degree_required", "cgpa", "contact_email", "contact_phone",
+    "application_method", "application_instructions", "application_url",
+    "number_of_positions", "tags", "job_link",
+]
+
+# Fields derived from the ingest fields in build_job; an upsert refreshes them too
+DERIVED_FIELDS = [
+    "deadline_on", "posted_on", "salary_min_monthly", "salary_max_monthly", "salary_currency",
+]
+
+SOURCE_HOSTS = {
+    "effoysira.com": "effoysira",
+    "ethiojobs.com.et": "ethiojobs",
+    "harmeejobs.com": "hamerejobs",
+    "hiringcafe.com": "hiring_cafe",
+}
+
+def _as_list(value):
+    return value if isinstance(value, list) else []
+
+def _clean_fields(job):
+    """
+    Runs each ingest field through its model field's clean() (type conversion, choices,
+    max_length, email/url validation). Values that don't fit become None, or the field's
+    default when it isn't nullable, so one bad record can't fail a whole bulk insert.
+    """
+    for name in INGEST_FIELDS:
+        field = Job._meta.get_field(name)
+        try:
+            value = field.clean(getattr(job, name), job)
+        except ValidationError:
+            value = None if field.null else field.get_default()
+        setattr(job, name, value)
+    return job
+
+def normalize_link(link):
+    """
+    Canonical form of a job link for use as an external id: https scheme, lowercase
+    host without "www.", no query, fragment or trailing slash.
+    """
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    return f"https://{host}{parts.path.rstrip('/')}"
+
+def natural_key(job_data, job_link):
+    """
+    Returns (source, external_id) for a structured job: the hiring_cafe id for
+    hiring_cafe jobs (any job with a job_hc_id), the normalized job link for the other
+    sites. The source falls back to the link's host when Gemini did not report a known one.
+    """
+    source = "hiring_cafe" if job_data.get("job_hc_id") else job_data.get("source")
+    if source not in SOURCE_HOSTS.values() and job_link:
+        source = SOURCE_HOSTS.get(urlsplit(job_link).netloc.lower().removeprefix("www."))
+    if source is None:
+        return None, None
+    if source == "hiring_cafe":
+        return source, job_data.get("job_hc_id") or urlsplit(job_link or "").path.strip("/") or None
+    return source, normalize_link(job_link) if job_link else None
+
+def build_job(job_data):
+    """
+    Maps one structured job dict (as returned by MainScraper) to an unsaved Job.
+    List fields always become lists, values that don't fit their model field are
+    dropped (see _clean_fields) and hiring_cafe jobs get their canonical link.
+    """
+    requirements = job_data.get("requirements") or {}
+    education_level = job_data.get("education_level") or {}
+
+    # --- Fix job_link for hiring_cafe ---
+    job_link = job_data.get("job_link")
+    job_hc_id = job_data.get("job_hc_id")
+    if job_hc_id:
+        job_link = hiring_cafe_job_link(job_hc_id)
+    source, external_id = natural_key(job_data, job_link)
+    salary_min_monthly, salary_max_monthly, salary_currency = parse_salary(
+        job_data.get("salary"), job_data.get("salary_min"), job_data.get("salary_max")
+    )
+
+    job = _clean_fields(Job(
+        title=job_data.get("title"),
+        company=job_data.get("company"),
+        description=job_data.get("description") or "",
+        gender=requirements.get("gender"),
+        agemax=requirements.get("agemax"),
+        agemin=requirements.get("agemin"),
+        other_requirements=requirements.get("other"),
+        skills=_as_list(requirements.get("skills")),
+        is_online=job_data.get("isOnline"),
+        is_remote=job_data.get("is_remote"),
+        location=_as_list(job_data.get("location")),
+        country=job_data.get("country"),
+        city=job_data.get("city"),
+        address=job_data.get("address"),
+        salary=job_data.get("salary"),
+        salary_min=job_data.get("salary_min"),
+        salary_max=job_data.get("salary_max"),
+        salary_min_monthly=salary_min_monthly,
+        salary_max_monthly=salary_max_monthly,
+        salary_currency=salary_currency,
+        deadline=job_data.get("deadline"),
+        deadline_on=parse_date(job_data.get("deadline")),
+        job_type=job_data.get("job_type"),
+        category=job_data.get("category"),
+        posted_date=job_data.get("posted_date"),
+        posted_on=parse_date(job_data.get("posted_date")),
+        experience_level=job_data.get("experience_level"),
+        degree_required=education_level.get("degree_required"),
+        cgpa=education_level.get("cgpa"),
+        contact_email=job_data.get("contact_email"),
+        contact_phone=job_data.get("contact_phone"),
+        application_method=job_data.get("application_method"),
+        application_instructions=job_data.get("application_instructions"),
+        application_url=job_data.get("application_url"),
+        number_of_positions=job_data.get("number_of_positions"),
+        tags=_as_list(job_data.get("tags")),
+        job_link=job_link,
+        source=source,
+        external_id=external_id,
+    ))
+    job.category = job.category or "Others"
+    return job
+
+def save_jobs(jobs_data, batch_size=BULK_CREATE_BATCH_SIZE, upsert=False):
+    """
+    Validates and normalizes structured jobs in memory, then writes them with
+    bulk_create in chunks of `batch_size` inside a single transaction.
+    With upsert=True, jobs whose (source, external_id) already exists are updated
+    in place instead of inserted again; repeats within jobs_data collapse to the last one.
+    Returns the saved Job objects.
+    """
+    jobs = [build_job(job_data) for job_data in jobs_data]
+    if not upsert:
+        with transaction.atomic():
+            return Job.objects.bulk_create(jobs, batch_size=batch_size)
+
+    keyed = {}
+    unkeyed = []
+    for job in jobs:
+        if job.source and job.external_id:
+            keyed[(job.source, job.external_id)] = job
+        else:
+            unkeyed.append(job)
+    with transaction.atomic():
+        saved = Job.objects.bulk_create(
+            list(keyed.values()),
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["source", "external_id"],
+            update_fields=INGEST_FIELDS + DERIVED_FIELDS,
+        )
+        saved += Job.objects.bulk_create(unkeyed, batch_size=batch_size)
+    return saved
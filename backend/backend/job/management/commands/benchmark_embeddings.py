@@ -0,0 +1,85 @@
+import gc
+import resource
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from job.embeddings import EMBEDDING_BACKENDS, job_embedding_text, load_embedding_model
+from job.models import Job
+
+SAMPLE_TEXTS = [
+    "Senior Python backend developer with Django and PostgreSQL experience",
+    "Accountant for a commercial bank branch in Addis Ababa",
+    "Registered nurse for a private hospital, night shifts",
+    "Project officer for an NGO working on water and sanitation",
+    "Sales and marketing manager for an FMCG distributor",
+    "Remote data analyst with SQL, Excel and Power BI",
+]
+
+def _rss_mb():
+    # Current resident set size on Linux, falling back to the peak RSS elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _normalize(vectors):
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+class Command(BaseCommand):
+    help = (
+        "Compares an embedding backend against the PyTorch baseline: cosine-score parity "
+        "on job texts, texts/second and resident memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", default="onnx-int8", choices=[b for b in EMBEDDING_BACKENDS if b != "torch"])
+        parser.add_argument("--texts", type=int, default=512, help="Number of job texts to encode.")
+        parser.add_argument("--batch-size", type=int, default=64)
+        parser.add_argument("--min-cosine", type=float, default=0.98,
+                            help="Fail if any text's vector is less similar than this to the baseline.")
+
+    def _run_backend(self, backend, texts, batch_size):
+        rss_before = _rss_mb()
+        model = load_embedding_model(backend)
+        model.encode(texts[:batch_size], batch_size=batch_size)  # warm up
+        start = time.perf_counter()
+        vectors = model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+        elapsed = time.perf_counter() - start
+        rss = _rss_mb() - rss_before
+        del model
+        gc.collect()
+        self.stdout.write(f"{backend:<12} {len(texts) / elapsed:>10.1f} texts/s {rss:>10.1f} MB RSS")
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+    def handle(self, *args, **options):
+        texts = [job_embedding_text(job) for job in Job.objects.order_by("id")[:options["texts"]]]
+        if not texts:
+            texts = SAMPLE_TEXTS
+        texts = (texts * (options["texts"] // len(texts) + 1))[:options["texts"]]
+
+        self.stdout.write(f"Encoding {len(texts)} texts, batch size {options['batch_size']}")
+        candidate = self._run_backend(options["backend"], texts, options["batch_size"])
+        baseline = self._run_backend("torch", texts, options["batch_size"])
+
+        # Vector parity: cosine between each text's baseline and candidate vector
+        cosines = np.sum(baseline * candidate, axis=1)
+        # Score parity: profile-to-job style cosine scores computed with each backend
+        queries = _normalize(np.asarray(load_embedding_model("torch").encode(SAMPLE_TEXTS), dtype=np.float32))
+        baseline_scores = queries @ baseline.T
+        candidate_scores = queries @ candidate.T
+        score_diff = np.abs(baseline_scores - candidate_scores)
+        k = min(10, len(texts))
+        overlap = np.mean([
+            len(set(np.argsort(-b)[:k]) & set(np.argsort(-c)[:k])) / k
+            for b, c in zip(baseline_scores, candidate_scores)
+        ])
+
+        self.stdout.write(f"vector cosine vs torch: min {cosines.min():.4f}, mean {cosines.mean():.4f}")
+        self.stdout.write(f"score abs diff: max {score_diff.max():.4f}, mean {score_diff.mean():.4f}")
+        self.stdout.write(f"top-{k} overlap with torch ranking: {overlap:.2%}")
+        if cosines.min() < options["min_cosine"]:
+            raise CommandError(f"Parity check failed: min cosine {cosines.min():.4f} < {options['min_cosine']}")
+        self.stdout.write(self.style.SUCCESS("Parity check passed."))
@@ -0,0 +1,67 @@
+import os
+
+from django.db import transaction
+
+from .embeddings import COLLECTION_NAME, nearest_jobs
+from .models import Job, JobMatch
+
+# Number of best-scoring jobs kept per user on each match run
+MATCH_TOP_K = int(os.getenv("MATCH_TOP_K", "200"))
+# Rows per INSERT ... ON CONFLICT statement when saving matches
+MATCH_SAVE_BATCH_SIZE = 500
+
+def clean_text(text):
+    if not text:
+        return ""
+    return str(text).strip().replace("\n", " ").replace(",", " ")
+
+def profile_to_text(profile):
+    fields = [
+        clean_text(profile.job_title),
+        clean_text(profile.skills),
+        clean_text(profile.experience),
+        clean_text(profile.bio),
+        clean_text(profile.preferred_locations),
+        clean_text(profile.job_types),
+    ]
+    return " ".join([f for f in fields if f])
+
+def match_percentage(score):
+    # Cosine similarity is in [-1, 1]; anything below 0 is no match at all
+    return float(round(max(score, 0.0) * 100, 2))
+
+def match_jobs_for_profile(user_profile, top_k=MATCH_TOP_K, collection_name=COLLECTION_NAME):
+    """
+    Embeds the profile once and runs a single top-k nearest-neighbour search over the
+    stored job vectors in Qdrant. Returns [(job, match_percentage)], best first, with the
+    jobs loaded in one query. Jobs deleted since they were embedded are skipped.
+    """
+    text = profile_to_text(user_profile)
+    if not text:
+        return []
+    hits = nearest_jobs(text, top_k, collection_name)
+
+    jobs_by_id = Job.objects.in_bulk([job_id for job_id, _ in hits])
+    return [(jobs_by_id[job_id], match_percentage(score)) for job_id, score in hits if job_id in jobs_by_id]
+
+def save_matches(user_profile, matches, batch_size=MATCH_SAVE_BATCH_SIZE):
+    """
+    Replaces the user's stored matches with `matches` ([(job_id, match_percentage)]).
+    Scores are upserted on the (user_profile, job) unique constraint in chunks of
+    `batch_size`, and matches for jobs no longer in the list are deleted, all in
+    one transaction. Returns the number of matches saved.
+    """
+    rows = [
+        JobMatch(user_profile=user_profile, job_id=job_id, match_percentage=percentage)
+        for job_id, percentage in matches
+    ]
+    with transaction.atomic():
+        JobMatch.objects.filter(user_profile=user_profile).exclude(job_id__in=[job_id for job_id, _ in matches]).delete()
+        JobMatch.objects.bulk_create(
+            rows,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["user_profile", "job"],
+            update_fields=["match_percentage", "calculated_at"],
+        )
+    return len(rows)
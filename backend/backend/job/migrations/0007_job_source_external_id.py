@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:07
+
+from urllib.parse import urlsplit
+
+from django.db import migrations, models
+
+SOURCE_HOSTS = {
+    "effoysira.com": "effoysira",
+    "ethiojobs.com.et": "ethiojobs",
+    "harmeejobs.com": "hamerejobs",
+    "hiringcafe.com": "hiring_cafe",
+}
+
+
+def normalize_link(link):
+    # Frozen copy of job.ingest.normalize_link
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    return f"https://{host}{parts.path.rstrip('/')}"
+
+
+def backfill_natural_keys(apps, schema_editor):
+    """
+    Derives source/external_id for existing scraped jobs from their job_link.
+    Only the oldest row of any duplicate group gets the key, so the unique
+    constraint can be added without deleting anything.
+    """
+    Job = apps.get_model("job", "Job")
+    seen = set()
+    to_update = []
+    for job in Job.objects.exclude(job_link__isnull=True).exclude(job_link="").order_by("id").iterator():
+        parts = urlsplit(job.job_link)
+        source = SOURCE_HOSTS.get(parts.netloc.lower().removeprefix("www."))
+        if source is None:
+            continue
+        external_id = parts.path.strip("/") if source == "hiring_cafe" else normalize_link(job.job_link)
+        if not external_id or (source, external_id) in seen:
+            continue
+        seen.add((source, external_id))
+        job.source = source
+        job.external_id = external_id
+        to_update.append(job)
+    Job.objects.bulk_update(to_update, ["source", "external_id"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0006_job_posted_by'),
+        ('user', '0004_recruiterprofile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='source',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.RunPython(backfill_natural_keys, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(fields=('source', 'external_id'), name='unique_job_source_external_id'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0007_job_source_external_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='embedding_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='embedding_model',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:13
+
+from datetime import datetime
+
+from django.db import migrations, models
+
+# Frozen copy of the deadline parser as of this migration; job.normalize has moved on
+DATE_FORMATS = ("%Y-%m-%d", "%B %d, %Y")
+
+
+def parse_date(value):
+    if not value:
+        return None
+    value = " ".join(str(value).split())
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def backfill_deadline_on(apps, schema_editor):
+    Job = apps.get_model("job", "Job")
+    to_update = []
+    for job in Job.objects.exclude(deadline__isnull=True).exclude(deadline="").only("id", "deadline").iterator():
+        job.deadline_on = parse_date(job.deadline)
+        if job.deadline_on:
+            to_update.append(job)
+    Job.objects.bulk_update(to_update, ["deadline_on"], batch_size=500)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0008_job_embedding_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='deadline_on',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_deadline_on, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:15
+
+from django.db import migrations
+
+FTS_COLUMNS = ["title", "company", "category", "skills", "tags", "description"]
+
+# External-content FTS5 index over job_job, kept in sync by triggers.
+# Note: Django rebuilds SQLite tables for some AlterField/RemoveField operations,
+# which drops these triggers; such migrations must re-run create_search_index.
+SQLITE_SETUP = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5("
+    + ", ".join(FTS_COLUMNS)
+    + ", content='job_job', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS job_fts_ai AFTER INSERT ON job_job BEGIN "
+    "INSERT INTO job_fts(rowid, {cols}) VALUES (new.id, {new}); END",
+    "CREATE TRIGGER IF NOT EXISTS job_fts_ad AFTER DELETE ON job_job BEGIN "
+    "INSERT INTO job_fts(job_fts, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+    "CREATE TRIGGER IF NOT EXISTS job_fts_au AFTER UPDATE OF {cols} ON job_job BEGIN "
+    "INSERT INTO job_fts(job_fts, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+    "INSERT INTO job_fts(rowid, {cols}) VALUES (new.id, {new}); END",
+    "INSERT INTO job_fts(job_fts) VALUES ('rebuild')",
+]
+SQLITE_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS job_fts_ai",
+    "DROP TRIGGER IF EXISTS job_fts_ad",
+    "DROP TRIGGER IF EXISTS job_fts_au",
+    "DROP TABLE IF EXISTS job_fts",
+]
+
+# Must match job.search.PG_DOCUMENT so the planner can use the index
+PG_DOCUMENT = (
+    "to_tsvector('english', "
+    + " || ' ' || ".join(f"coalesce({col}::text, '')" for col in FTS_COLUMNS)
+    + ")"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        fields = {
+            "cols": ", ".join(FTS_COLUMNS),
+            "new": ", ".join(f"new.{col}" for col in FTS_COLUMNS),
+            "old": ", ".join(f"old.{col}" for col in FTS_COLUMNS),
+        }
+        for statement in SQLITE_SETUP:
+            schema_editor.execute(statement.format(**fields))
+    elif vendor == "postgresql":
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS job_job_search_idx ON job_job USING GIN ({PG_DOCUMENT})")
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_TEARDOWN:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS job_job_search_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0009_job_deadline_on'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:18
+
+import re
+from datetime import datetime
+
+from django.db import migrations, models
+
+# Frozen copy of job.normalize.parse_date as of this migration. Relative forms
+# ("3 days ago") are left unparsed: they can't be anchored to a date after the fact.
+DATE_FORMATS = (
+    "%Y-%m-%d", "%Y/%m/%d", "%B %d, %Y", "%b %d, %Y", "%B %d %Y", "%b %d %Y",
+    "%d %B, %Y", "%d %B %Y", "%d %b %Y", "%d-%b-%Y", "%d-%B-%Y", "%d-%b-%y",
+    "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%m/%d/%Y",
+)
+_ISO_PREFIX = re.compile(r"^(\d{4}-\d{2}-\d{2})[T ]")
+_ORDINAL = re.compile(r"(\d+)(st|nd|rd|th)\b", re.IGNORECASE)
+_WEEKDAY = re.compile(r"^(mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)[a-z]*\.?,?\s+", re.IGNORECASE)
+
+
+def parse_date(value):
+    if not value:
+        return None
+    text = " ".join(str(value).split())
+    iso = _ISO_PREFIX.match(text)
+    if iso:
+        text = iso.group(1)
+    else:
+        text = _WEEKDAY.sub("", text)
+        text = _ORDINAL.sub(r"\1", text)
+        text = text.replace(" ,", ",")
+        text = re.sub(r"\b([A-Za-z]{3})[a-z]?\.", r"\1", text)
+        text = re.sub(r"\bSept\b", "Sep", text, flags=re.IGNORECASE)
+        text = text.strip(" .")
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def backfill_dates(apps, schema_editor):
+    """
+    Fills posted_on and re-parses deadline_on with the multi-format parser, which
+    understands more of the existing strings than the one used by 0009.
+    """
+    Job = apps.get_model("job", "Job")
+    to_update = []
+    for job in Job.objects.only("id", "deadline", "posted_date", "deadline_on", "posted_on").iterator():
+        deadline_on = parse_date(job.deadline)
+        posted_on = parse_date(job.posted_date)
+        if (deadline_on, posted_on) != (job.deadline_on, job.posted_on):
+            job.deadline_on = deadline_on
+            job.posted_on = posted_on
+            to_update.append(job)
+    Job.objects.bulk_update(to_update, ["deadline_on", "posted_on"], batch_size=500)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0010_job_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='posted_on',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_dates, migrations.RunPython.noop),
+    ]
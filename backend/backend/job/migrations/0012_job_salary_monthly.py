@@ -0,0 +1,168 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:20
+
+import re
+from decimal import Decimal
+
+from django.db import migrations, models
+
+# Frozen copy of job.normalize.parse_salary as of this migration
+
+# Currency markers, checked in order against the lowercased salary text
+CURRENCY_MARKERS = (
+    ("ETB", ("etb", "birr", "br.", "br ")),
+    ("USD", ("usd", "us$", "$")),
+    ("EUR", ("eur", "€")),
+    ("GBP", ("gbp", "£")),
+    ("KES", ("kes", "ksh")),
+)
+# Multipliers from a quoted pay period to a monthly amount; amounts without one are monthly
+MONTHLY_FACTORS = {
+    "month": 1,
+    "year": 1 / 12,
+    "week": 52 / 12,
+    "day": 22,
+    "hour": 40 * 52 / 12,
+}
+# Words that name a pay period, mapped to their MONTHLY_FACTORS key
+PERIOD_WORDS = {
+    "month": "month", "months": "month", "mo": "month", "monthly": "month",
+    "year": "year", "years": "year", "yr": "year", "annum": "year", "annual": "year",
+    "annually": "year", "yearly": "year",
+    "week": "week", "weeks": "week", "wk": "week", "weekly": "week",
+    "day": "day", "days": "day", "daily": "day",
+    "hour": "hour", "hours": "hour", "hr": "hour", "hourly": "hour",
+}
+# Largest amount that fits Job.salary_*_monthly (DecimalField(max_digits=12, decimal_places=2))
+MAX_MONTHLY_AMOUNT = 10 ** 10
+
+_CURRENCY = r"(?:\betb\b|\bbirr\b|\bbr\b\.?|\busd\b|us\$|\$|\beur\b|€|\bgbp\b|£|\bkes\b|\bksh\b)"
+_PERIOD = "|".join(sorted(PERIOD_WORDS, key=len, reverse=True))
+_AMOUNT = re.compile(r"(?<![\w.])(\d{1,3}(?:[, ]\d{3})+|\d+)(?:\.(\d+))?(\s*k\b)?", re.IGNORECASE)
+_CURRENCY_BEFORE = re.compile(rf"{_CURRENCY}\s*$", re.IGNORECASE)
+_CURRENCY_AFTER = re.compile(rf"^\s*{_CURRENCY}", re.IGNORECASE)
+# Pay period written right after an amount: "/month", "per year", "a day", "monthly"
+_PERIOD_AFTER = re.compile(
+    rf"^\s*{_CURRENCY}?\s*(?:gross\s+|net\s+)?(?:/|per\b|an?\b|each\b)?\s*({_PERIOD})\b", re.IGNORECASE
+)
+# Pay period in the label right before an amount: "Monthly salary: 12000"
+_PERIOD_BEFORE = re.compile(
+    rf"\b({_PERIOD})\s+(?:gross\s+|net\s+|base\s+)?(?:salary|pay|wage|rate)\s*[:\-]?\s*{_CURRENCY}?\s*$", re.IGNORECASE
+)
+_SALARY_LABEL = re.compile(rf"\b(?:salary|pay|wage|rate)\s*[:\-]?\s*{_CURRENCY}?\s*$", re.IGNORECASE)
+# Numbers that count something other than money: "8 hours", "3 positions", "Grade 12"
+_NOT_MONEY_AFTER = re.compile(
+    r"^\s*(?:(?:hours?|hrs?|days?|weeks?|months?|years?|yrs?|positions?|posts?|vacanc(?:y|ies)|persons?|people"
+    r"|employees?)\b|%)",
+    re.IGNORECASE,
+)
+_NOT_MONEY_BEFORE = re.compile(r"\b(?:grade|level|step|band|scale)\s*$", re.IGNORECASE)
+_RANGE_JOINER = re.compile(rf"^\s*(?:-|–|—|to)\s*{_CURRENCY}?\s*$", re.IGNORECASE)
+# Fields holding nothing but numbers ("15000", "10,000 - 15,000"), where every number is an amount
+_NUMBERS_ONLY = re.compile(r"^[\d\s,.]+(?:(?:-|–|—|to)[\d\s,.]+)?$", re.IGNORECASE)
+
+
+def pay_period(before, after):
+    match = _PERIOD_AFTER.match(after) or _PERIOD_BEFORE.search(before)
+    return PERIOD_WORDS[match.group(1).lower()] if match else None
+
+
+def parse_amounts(text, strict=True):
+    text = text or ""
+    strict = strict and not _NUMBERS_ONLY.match(text.strip())
+    amounts = []
+    previous_end = None
+    for match in _AMOUNT.finditer(text):
+        whole, fraction, thousands = match.groups()
+        before, after = text[:match.start()], text[match.end():]
+        if _NOT_MONEY_AFTER.match(after) or _NOT_MONEY_BEFORE.search(before):
+            previous_end = None
+            continue
+        period = pay_period(before, after)
+        money = (
+            not strict
+            or period
+            or thousands
+            or re.search(r"[, ]\d{3}$", whole)
+            or _CURRENCY_BEFORE.search(before)
+            or _CURRENCY_AFTER.match(after)
+            or _SALARY_LABEL.search(before)
+            or (previous_end is not None and _RANGE_JOINER.match(text[previous_end:match.start()]))
+        )
+        if not money:
+            previous_end = None
+            continue
+        amount = float(re.sub(r"[, ]", "", whole) + (f".{fraction}" if fraction else ""))
+        if thousands:
+            amount *= 1000
+        if amount > 0:
+            amounts.append((amount, period))
+        previous_end = match.end()
+    return amounts
+
+
+def parse_currency(text):
+    text = f"{(text or '').lower()} "
+    for code, markers in CURRENCY_MARKERS:
+        if any(marker in text for marker in markers):
+            return code
+    return None
+
+
+def parse_salary(salary, salary_min=None, salary_max=None):
+    text_amounts = parse_amounts(str(salary or ""))[:2]
+    found = (
+        parse_amounts(str(salary_min or ""), strict=False)[:1]
+        + parse_amounts(str(salary_max or ""), strict=False)[:1]
+    ) or text_amounts
+    if not found:
+        return None, None, None
+
+    periods = [period for _, period in found + text_amounts if period]
+    factor = MONTHLY_FACTORS[periods[0]] if periods else 1
+    amounts = sorted(amount for amount, _ in found)
+    minimum, maximum = amounts[0] * factor, amounts[-1] * factor
+    if maximum >= MAX_MONTHLY_AMOUNT:
+        return None, None, None
+    text = " ".join(str(part) for part in (salary, salary_min, salary_max) if part)
+    return (
+        Decimal(str(round(minimum, 2))),
+        Decimal(str(round(maximum, 2))),
+        parse_currency(text),
+    )
+
+
+def backfill_salaries(apps, schema_editor):
+    Job = apps.get_model("job", "Job")
+    to_update = []
+    for job in Job.objects.only("id", "salary", "salary_min", "salary_max").iterator():
+        job.salary_min_monthly, job.salary_max_monthly, job.salary_currency = parse_salary(
+            job.salary, job.salary_min, job.salary_max
+        )
+        if job.salary_min_monthly is not None:
+            to_update.append(job)
+    Job.objects.bulk_update(to_update, ["salary_min_monthly", "salary_max_monthly", "salary_currency"], batch_size=500)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0011_job_posted_on'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='salary_currency',
+            field=models.CharField(blank=True, db_index=True, max_length=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max_monthly',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min_monthly',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.RunPython(backfill_salaries, migrations.RunPython.noop),
+    ]
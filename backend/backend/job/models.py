@@ -1,4 +1,5 @@
 from django.db import models
+from .normalize import parse_date, parse_salary
 from user.models import UserProfile,RecruiterProfile
 
 # Create your
@@ -70,6 +71,51 @@ class Job(models.Model):
     number_of_positions = models.PositiveIntegerField(null=True, blank=True)
     tags = models.JSONField(null=True, blank=True)
     job_link = models.URLField(null=True, blank=True)
+    # Natural key for scraped jobs: the site it came from and that site's id (or link) for it
+    source = models.CharField(max_length=50, null=True, blank=True)
+    external_id = models.CharField(max_length=255, null=True, blank=True)
+    # Hash of the text last sent to the embedding model, and which model encoded it
+    embedding_hash = models.CharField(max_length=64, null=True, blank=True)
+    embedding_model = models.CharField(max_length=100, null=True, blank=True)
+    # `deadline` and `posted_date` parsed into dates, for filtering and ordering in the database
+    deadline_on = models.DateField(null=True, blank=True, db_index=True)
+    posted_on = models.DateField(null=True, blank=True, db_index=True)
+    # `salary` / `salary_min` / `salary_max` parsed into monthly amounts and an ISO currency code
+    salary_min_monthly = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, db_index=True)
+    salary_max_monthly = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, db_index=True)
+    salary_currency = models.CharField(max_length=3, null=True, blank=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["source", "external_id"], name="unique_job_source_external_id"),
+        ]
+
+    # Raw date strings whose parsed value is kept in a DateField, mapped to that field
+    PARSED_DATE_FIELDS = {"deadline": "deadline_on", "posted_date": "posted_on"}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        job = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        job._loaded_dates = {field: loaded[field] for field in cls.PARSED_DATE_FIELDS if field in loaded}
+        return job
+
+    def save(self, *args, **kwargs):
+        # Only re-parse a date string that changed since it was loaded: relative values
+        # like "3 days ago" must stay anchored to the day they were first saved
+        loaded = getattr(self, "_loaded_dates", {})
+        deferred = self.get_deferred_fields()
+        for field, parsed_field in self.PARSED_DATE_FIELDS.items():
+            if field in deferred:
+                continue
+            value = getattr(self, field)
+            if field not in loaded or loaded[field] != value:
+                setattr(self, parsed_field, parse_date(value))
+        self.salary_min_monthly, self.salary_max_monthly, self.salary_currency = parse_salary(
+            self.salary, self.salary_min, self.salary_max
+        )
+        super().save(*args, **kwargs)
+        self._loaded_dates = {field: getattr(self, field) for field in self.PARSED_DATE_FIELDS if field not in deferred}
 
     def __str__(self):
         return f"{self.title} at {self.company}"
@@ -0,0 +1,215 @@
+import re
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+# Date formats seen in scraped deadline / posted date strings, tried in order.
+# Day-first numeric dates come before month-first ones, as on the Ethiopian sites.
+DATE_FORMATS = (
+    "%Y-%m-%d",      # 2025-09-10
+    "%Y/%m/%d",      # 2025/09/10
+    "%B %d, %Y",     # September 10, 2025
+    "%b %d, %Y",     # Sep 10, 2025
+    "%B %d %Y",      # September 10 2025
+    "%b %d %Y",      # Sep 10 2025
+    "%d %B, %Y",     # 10 September, 2025
+    "%d %B %Y",      # 10 September 2025
+    "%d %b %Y",      # 10 Sep 2025
+    "%d-%b-%Y",      # 10-Sep-2025
+    "%d-%B-%Y",      # 10-September-2025
+    "%d-%b-%y",      # 10-Sep-25
+    "%d/%m/%Y",      # 10/09/2025
+    "%d-%m-%Y",      # 10-09-2025
+    "%d.%m.%Y",      # 10.09.2025
+    "%m/%d/%Y",      # 09/30/2025
+)
+
+_ISO_PREFIX = re.compile(r"^(\d{4}-\d{2}-\d{2})[T ]")
+_ORDINAL = re.compile(r"(\d+)(st|nd|rd|th)\b", re.IGNORECASE)
+_WEEKDAY = re.compile(r"^(mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)[a-z]*\.?,?\s+", re.IGNORECASE)
+_RELATIVE = re.compile(r"^(\d+)\s+(day|week|month)s?\s+ago$", re.IGNORECASE)
+_RELATIVE_DAYS = {"day": 1, "week": 7, "month": 30}
+
+def _clean_date_text(value):
+    text = " ".join(str(value).split())
+    iso = _ISO_PREFIX.match(text)
+    if iso:
+        return iso.group(1)
+    text = _WEEKDAY.sub("", text)
+    text = _ORDINAL.sub(r"\1", text)
+    text = text.replace(" ,", ",")
+    # "Sept." / "Sep." -> "Sep"
+    text = re.sub(r"\b([A-Za-z]{3})[a-z]?\.", r"\1", text)
+    text = re.sub(r"\bSept\b", "Sep", text, flags=re.IGNORECASE)
+    return text.strip(" .")
+
+def parse_date(value, today=None):
+    """
+    Parses a scraped date string into a date. Accepts any of DATE_FORMATS (ignoring
+    weekday names, ordinal suffixes and abbreviation dots), ISO timestamps, and
+    relative forms like "today", "yesterday" or "3 days ago" (counted from `today`).
+    Returns None when it is empty or can't be parsed.
+    """
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value.date() if isinstance(value, datetime) else value
+    text = _clean_date_text(value)
+    if not text:
+        return None
+
+    lowered = text.lower()
+    today = today or date.today()
+    if lowered == "today":
+        return today
+    if lowered == "yesterday":
+        return today - timedelta(days=1)
+    relative = _RELATIVE.match(lowered)
+    if relative:
+        return today - timedelta(days=int(relative.group(1)) * _RELATIVE_DAYS[relative.group(2)])
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+# --- Salary ---
+# Currency markers, checked in order against the lowercased salary text
+CURRENCY_MARKERS = (
+    ("ETB", ("etb", "birr", "br.", "br ")),
+    ("USD", ("usd", "us$", "$")),
+    ("EUR", ("eur", "€")),
+    ("GBP", ("gbp", "£")),
+    ("KES", ("kes", "ksh")),
+)
+# Multipliers from a quoted pay period to a monthly amount; amounts without one are monthly
+MONTHLY_FACTORS = {
+    "month": 1,
+    "year": 1 / 12,
+    "week": 52 / 12,
+    "day": 22,
+    "hour": 40 * 52 / 12,
+}
+# Words that name a pay period, mapped to their MONTHLY_FACTORS key
+PERIOD_WORDS = {
+    "month": "month", "months": "month", "mo": "month", "monthly": "month",
+    "year": "year", "years": "year", "yr": "year", "annum": "year", "annual": "year",
+    "annually": "year", "yearly": "year",
+    "week": "week", "weeks": "week", "wk": "week", "weekly": "week",
+    "day": "day", "days": "day", "daily": "day",
+    "hour": "hour", "hours": "hour", "hr": "hour", "hourly": "hour",
+}
+# Largest amount that fits Job.salary_*_monthly (DecimalField(max_digits=12, decimal_places=2))
+MAX_MONTHLY_AMOUNT = 10 ** 10
+
+_CURRENCY = r"(?:\betb\b|\bbirr\b|\bbr\b\.?|\busd\b|us\$|\$|\beur\b|€|\bgbp\b|£|\bkes\b|\bksh\b)"
+_PERIOD = "|".join(sorted(PERIOD_WORDS, key=len, reverse=True))
+_AMOUNT = re.compile(r"(?<![\w.])(\d{1,3}(?:[, ]\d{3})+|\d+)(?:\.(\d+))?(\s*k\b)?", re.IGNORECASE)
+_CURRENCY_BEFORE = re.compile(rf"{_CURRENCY}\s*$", re.IGNORECASE)
+_CURRENCY_AFTER = re.compile(rf"^\s*{_CURRENCY}", re.IGNORECASE)
+# Pay period written right after an amount: "/month", "per year", "a day", "monthly"
+_PERIOD_AFTER = re.compile(
+    rf"^\s*{_CURRENCY}?\s*(?:gross\s+|net\s+)?(?:/|per\b|an?\b|each\b)?\s*({_PERIOD})\b", re.IGNORECASE
+)
+# Pay period in the label right before an amount: "Monthly salary: 12000"
+_PERIOD_BEFORE = re.compile(
+    rf"\b({_PERIOD})\s+(?:gross\s+|net\s+|base\s+)?(?:salary|pay|wage|rate)\s*[:\-]?\s*{_CURRENCY}?\s*$", re.IGNORECASE
+)
+_SALARY_LABEL = re.compile(rf"\b(?:salary|pay|wage|rate)\s*[:\-]?\s*{_CURRENCY}?\s*$", re.IGNORECASE)
+# Numbers that count something other than money: "8 hours", "3 positions", "Grade 12"
+_NOT_MONEY_AFTER = re.compile(
+    r"^\s*(?:(?:hours?|hrs?|days?|weeks?|months?|years?|yrs?|positions?|posts?|vacanc(?:y|ies)|persons?|people"
+    r"|employees?)\b|%)",
+    re.IGNORECASE,
+)
+_NOT_MONEY_BEFORE = re.compile(r"\b(?:grade|level|step|band|scale)\s*$", re.IGNORECASE)
+_RANGE_JOINER = re.compile(rf"^\s*(?:-|–|—|to)\s*{_CURRENCY}?\s*$", re.IGNORECASE)
+# Fields holding nothing but numbers ("15000", "10,000 - 15,000"), where every number is an amount
+_NUMBERS_ONLY = re.compile(r"^[\d\s,.]+(?:(?:-|–|—|to)[\d\s,.]+)?$", re.IGNORECASE)
+
+def pay_period(before, after):
+    """
+    Returns the MONTHLY_FACTORS key for a pay period written right next to an
+    amount, given the text before and after it, or None.
+    """
+    match = _PERIOD_AFTER.match(after) or _PERIOD_BEFORE.search(before)
+    return PERIOD_WORDS[match.group(1).lower()] if match else None
+
+def parse_amounts(text, strict=True):
+    """
+    Returns the money amounts in `text` as [(amount, pay period or None)], in order.
+    With strict=True (free text) a number only counts when it sits next to a currency
+    marker, a pay period or a "salary:" label, has a "k" suffix, is written with
+    thousands separators, or continues a range ("10,000 - 15000"); numbers of hours,
+    days, positions or grades never count. Text that is only numbers always counts.
+    """
+    text = text or ""
+    strict = strict and not _NUMBERS_ONLY.match(text.strip())
+    amounts = []
+    previous_end = None
+    for match in _AMOUNT.finditer(text):
+        whole, fraction, thousands = match.groups()
+        before, after = text[:match.start()], text[match.end():]
+        if _NOT_MONEY_AFTER.match(after) or _NOT_MONEY_BEFORE.search(before):
+            previous_end = None
+            continue
+        period = pay_period(before, after)
+        money = (
+            not strict
+            or period
+            or thousands
+            or re.search(r"[, ]\d{3}$", whole)
+            or _CURRENCY_BEFORE.search(before)
+            or _CURRENCY_AFTER.match(after)
+            or _SALARY_LABEL.search(before)
+            or (previous_end is not None and _RANGE_JOINER.match(text[previous_end:match.start()]))
+        )
+        if not money:
+            previous_end = None
+            continue
+        amount = float(re.sub(r"[, ]", "", whole) + (f".{fraction}" if fraction else ""))
+        if thousands:
+            amount *= 1000
+        if amount > 0:
+            amounts.append((amount, period))
+        previous_end = match.end()
+    return amounts
+
+def parse_currency(text):
+    text = f"{(text or '').lower()} "
+    for code, markers in CURRENCY_MARKERS:
+        if any(marker in text for marker in markers):
+            return code
+    return None
+
+def parse_salary(salary, salary_min=None, salary_max=None):
+    """
+    Normalizes the scraped salary strings into (min_monthly, max_monthly, currency).
+    Amounts come from salary_min / salary_max when they hold numbers, otherwise from
+    the first one or two money amounts in `salary` ("ETB 10,000 - 15,000/month",
+    "$60k a year"; see parse_amounts). A single amount is used as both min and max.
+    The pay period is only read next to the amounts, so "ETB 20,000 + annual bonus"
+    stays monthly. Amounts are Decimals rounded to cents; everything is None for text
+    like "Negotiable".
+    """
+    text_amounts = parse_amounts(str(salary or ""))[:2]
+    found = (
+        parse_amounts(str(salary_min or ""), strict=False)[:1]
+        + parse_amounts(str(salary_max or ""), strict=False)[:1]
+    ) or text_amounts
+    if not found:
+        return None, None, None
+
+    periods = [period for _, period in found + text_amounts if period]
+    factor = MONTHLY_FACTORS[periods[0]] if periods else 1
+    amounts = sorted(amount for amount, _ in found)
+    minimum, maximum = amounts[0] * factor, amounts[-1] * factor
+    if maximum >= MAX_MONTHLY_AMOUNT:
+        return None, None, None
+    text = " ".join(str(part) for part in (salary, salary_min, salary_max) if part)
+    return (
+        Decimal(str(round(minimum, 2))),
+        Decimal(str(round(maximum, 2))),
+        parse_currency(text),
+    )
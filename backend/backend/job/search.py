@@ -0,0 +1,107 @@
+import re
+
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from .embeddings import nearest_jobs
+
+# Indexed columns and their BM25 weights, in job_fts column order (see migration 0010)
+FTS_WEIGHTS = {
+    "title": 10.0,
+    "company": 5.0,
+    "category": 3.0,
+    "skills": 4.0,
+    "tags": 2.0,
+    "description": 1.0,
+}
+
+# Candidates taken from each of the lexical and semantic rankings in hybrid mode
+HYBRID_CANDIDATES = 100
+# Reciprocal rank fusion constant: larger values flatten the gap between top ranks
+RRF_K = 60
+
+# Must match the expression indexed in migration 0010
+PG_DOCUMENT = (
+    "to_tsvector('english', "
+    + " || ' ' || ".join(f"coalesce({col}::text, '')" for col in FTS_WEIGHTS)
+    + ")"
+)
+
+def fts5_query(term):
+    """
+    Turns free text into an FTS5 query: every word must match, as a prefix, so
+    "python dev" finds "Python Developer". Quoting keeps FTS5 syntax out of user input.
+    """
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", term))
+
+def full_text_search(jobs_qs, term):
+    """
+    Filters jobs_qs to jobs matching `term` through the database's full-text index
+    and annotates `search_score` (higher is more relevant): BM25 on SQLite (FTS5),
+    ts_rank_cd on Postgres. Other backends fall back to icontains with a flat score.
+    """
+    if connection.vendor == "sqlite":
+        query = fts5_query(term)
+        if not query:
+            return jobs_qs.none().annotate(search_score=Value(0.0, output_field=FloatField()))
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS.values())
+        # bm25() is lower for better matches, so negate it
+        return jobs_qs.filter(
+            id__in=RawSQL("SELECT rowid FROM job_fts WHERE job_fts MATCH %s", (query,))
+        ).annotate(search_score=RawSQL(
+            f"SELECT -bm25(job_fts, {weights}) FROM job_fts WHERE job_fts MATCH %s AND rowid = job_job.id",
+            (query,),
+            output_field=FloatField(),
+        ))
+
+    if connection.vendor == "postgresql":
+        return jobs_qs.filter(
+            id__in=RawSQL(f"SELECT id FROM job_job WHERE {PG_DOCUMENT} @@ websearch_to_tsquery('english', %s)", (term,))
+        ).annotate(search_score=RawSQL(
+            f"ts_rank_cd({PG_DOCUMENT}, websearch_to_tsquery('english', %s))",
+            (term,),
+            output_field=FloatField(),
+        ))
+
+    return jobs_qs.filter(
+        Q(title__icontains=term)
+        | Q(company__icontains=term)
+        | Q(category__icontains=term)
+        | Q(skills__icontains=term)
+    ).annotate(search_score=Value(0.0, output_field=FloatField()))
+
+def reciprocal_rank_fusion(*rankings, k=RRF_K):
+    """
+    Fuses ranked lists of job ids: each list adds 1 / (k + rank) to a job's score.
+    Returns {job_id: score}.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, job_id in enumerate(ranking, start=1):
+            scores[job_id] = scores.get(job_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
+def hybrid_search(jobs_qs, term, candidates=HYBRID_CANDIDATES):
+    """
+    Runs the full-text search and a Qdrant nearest-neighbour search for `term` (encoded
+    once), fuses the two top-`candidates` rankings with reciprocal rank fusion, and
+    returns jobs_qs limited to the fused candidates, annotated with `search_score`.
+    If Qdrant is unavailable the lexical ranking is used on its own.
+    """
+    lexical = list(
+        full_text_search(jobs_qs, term).order_by("-search_score", "id").values_list("id", flat=True)[:candidates]
+    )
+    try:
+        semantic = [job_id for job_id, _ in nearest_jobs(term, candidates)]
+    except Exception as e:
+        print("Semantic search error:", e)
+        semantic = []
+
+    scores = reciprocal_rank_fusion(lexical, semantic)
+    if not scores:
+        return jobs_qs.none().annotate(search_score=Value(0.0, output_field=FloatField()))
+    return jobs_qs.filter(id__in=scores.keys()).annotate(search_score=Case(
+        *[When(id=job_id, then=Value(score)) for job_id, score in scores.items()],
+        output_field=FloatField(),
+    ))
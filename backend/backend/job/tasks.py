@@ -2,21 +2,34 @@ from celery import shared_task
 from user.models import UserProfile
 from job.models import Job
 from job.models import ScraperState  # <-- Import ScraperState
+from job.ingest import save_jobs
+from job.embeddings import embed_jobs, delete_job_points, get_qdrant_client
 from scrapers.main_scraper import MainScraper
 from dotenv import load_dotenv
 import os
 import json
 import time
-from django.core.validators import validate_email, URLValidator
-from django.core.exceptions import ValidationError
-from sentence_transformers import SentenceTransformer
-from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance
-from datetime import datetime, timedelta
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
 
 
 
 
+# Keeps each IN (...) lookup under SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+def known_job_links(links):
+    """
+    Returns the subset of `links` already stored as Job.job_link, using one query per chunk.
+    """
+    links = list(set(links))
+    known = set()
+    for i in range(0, len(links), LOOKUP_CHUNK_SIZE):
+        chunk = links[i:i + LOOKUP_CHUNK_SIZE]
+        known.update(Job.objects.filter(job_link__in=chunk).values_list("job_link", flat=True))
+    return known
+
 @shared_task
 def scrape_and_save_jobs():
     load_dotenv()
@@ -45,7 +58,8 @@ def scrape_and_save_jobs():
             last_scraped,
             max_pages=PAGE_COUNT,
             batch_size=BATCH_SIZE,
-            rate_limit_seconds=RATE_LIMIT_SECONDS
+            rate_limit_seconds=RATE_LIMIT_SECONDS,
+            known_links=known_job_links
         )
     else:
         # Pass num_jobs if no scraper state
@@ -54,7 +68,8 @@ def scrape_and_save_jobs():
             max_pages=PAGE_COUNT,
             batch_size=BATCH_SIZE,
             rate_limit_seconds=RATE_LIMIT_SECONDS,
-            num_jobs=PAGE_COUNT
+            num_jobs=PAGE_COUNT,
+            known_links=known_job_links
         )
 
     latest_effoysira = None
@@ -62,86 +77,11 @@ def scrape_and_save_jobs():
     latest_hamerejobs = None
     latest_hiring_cafe = None
 
-    for job_data in all_structured.get("jobs", []):
-        requirements = job_data.get("requirements", {}) or {}
-        education_level = job_data.get("education_level", {}) or {}
-
-        # --- Set category/description defaults ---
-        category = job_data.get("category") or "Others"
-        description = job_data.get("description") or ""
-
-        # --- CamelCase to snake_case ---
-        is_online = job_data.get("isOnline")
-        is_remote = job_data.get("is_remote")
-
-        # --- Always use lists for list fields ---
-        skills = requirements.get("skills") if isinstance(requirements.get("skills"), list) else []
-        location = job_data.get("location") if isinstance(job_data.get("location"), list) else []
-        tags = job_data.get("tags") if isinstance(job_data.get("tags"), list) else []
-
-        # --- Validate email/url fields ---
-        contact_email = job_data.get("contact_email")
-        try:
-            if contact_email:
-                validate_email(contact_email)
-            else:
-                contact_email = None
-        except ValidationError:
-            contact_email = None
-
-        application_url = job_data.get("application_url")
-        url_validator = URLValidator()
-        try:
-            if application_url:
-                url_validator(application_url)
-            else:
-                application_url = None
-        except ValidationError:
-            application_url = None
-
-        # --- Fix job_link for hiring_cafe ---
-        job_link = job_data.get("job_link")
-        job_hc_id = job_data.get("job_hc_id")
-        source = job_data.get("source")
-        if source == "hiring_cafe" and job_hc_id:
-            job_link = f"https://hiringcafe.com/{job_hc_id}"
-
-        # Save job to DB
-        job_obj = Job.objects.create(
-            title=job_data.get("title"),
-            company=job_data.get("company"),
-            description=description,
-            gender=requirements.get("gender"),
-            agemax=requirements.get("agemax"),
-            agemin=requirements.get("agemin"),
-            other_requirements=requirements.get("other"),
-            skills=skills,
-            is_online=is_online,
-            is_remote=is_remote,
-            location=location,
-            country=job_data.get("country"),
-            city=job_data.get("city"),
-            address=job_data.get("address"),
-            salary=job_data.get("salary"),
-            salary_min=job_data.get("salary_min"),
-            salary_max=job_data.get("salary_max"),
-            deadline=job_data.get("deadline"),
-            job_type=job_data.get("job_type"),
-            category=category,
-            posted_date=job_data.get("posted_date"),
-            experience_level=job_data.get("experience_level"),
-            degree_required=education_level.get("degree_required"),
-            cgpa=education_level.get("cgpa"),
-            contact_email=contact_email,
-            contact_phone=job_data.get("contact_phone"),
-            application_method=job_data.get("application_method"),
-            application_instructions=job_data.get("application_instructions"),
-            application_url=application_url,
-            number_of_positions=job_data.get("number_of_positions"),
-            tags=tags,
-            job_link=job_link,
-        )
+    structured_jobs = all_structured.get("jobs", [])
+    saved = save_jobs(structured_jobs, upsert=True)
+    print(f"Saved {len(saved)} jobs.")
 
+    for job_data in structured_jobs:
         # Track latest job links/ids for each source
         source = job_data.get("source")
         if source == "effoysira" and job_data.get("job_link"):
@@ -165,92 +105,56 @@ def scrape_and_save_jobs():
             scraper_state.hiring_cafe_last_job_id = latest_hiring_cafe
         scraper_state.save()
 
-    # --- Embedding and Qdrant setup ---
-    print("Connecting to Qdrant...")
-    qdrant = QdrantClient(host="localhost", port=6333)
-    collection_name = "jobs"
-
-    print("Checking existing collections in Qdrant...")
-    collections = qdrant.get_collections()
-    print("Current collections:", [c.name for c in collections.collections])
-
-    # Create collection if it doesn't exist
-    if collection_name not in [c.name for c in collections.collections]:
-        print(f"Collection '{collection_name}' does not exist. Creating...")
-        qdrant.recreate_collection(
-            collection_name=collection_name,
-            vectors_config=VectorParams(size=384, distance=Distance.COSINE)  # 384 for MiniLM
-        )
-        print(f"Collection '{collection_name}' created.")
-    else:
-        print(f"Collection '{collection_name}' already exists.")
-
-    # Load embedding model
-    print("Loading embedding model...")
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    print("Embedding model loaded.")
-
-    # Fetch all jobs (or filter for new ones)
-    jobs = Job.objects.all()
-    print(f"Number of jobs to embed: {len(jobs)}")
-    points = []
-    for job in jobs:
-        # Ensure tags and skills are lists (not QuerySets or None)
-        tags = list(job.tags) if job.tags and not isinstance(job.tags, list) else (job.tags or [])
-        skills = list(job.skills) if job.skills and not isinstance(job.skills, list) else (job.skills or [])
-
-        print(f"Job ID: {job.id} (type: {type(job.id)}), tags type: {type(tags)}, skills type: {type(skills)}")
-
-        text = f"{job.title or ''} {job.company or ''} {job.description or ''} {skills} {tags}"
-        embedding = model.encode(text)
-        points.append({
-            "id": int(job.id),  # Use integer ID for Qdrant
-            "vector": embedding.tolist(),
-            "payload": {
-                "title": job.title,
-                "company": job.company,
-                "description": job.description,
-                "tags": tags,
-                "skills": skills,
-            }
-        })
+    # --- Embed new or changed jobs into Qdrant ---
+    try:
+        embed_jobs()
+    except Exception as e:
+        print("Embedding error:", e)
 
-    print(f"Prepared {len(points)} points for upsert.")
-    # Upsert all points to Qdrant
-    if points:
-        print(f"Upserting {len(points)} points to Qdrant collection '{collection_name}'...")
-        try:
-            qdrant.upsert(
-                collection_name=collection_name,
-                points=points
-            )
-            print("Upsert complete.")
-        except Exception as e:
-            print("Qdrant upsert error:", e)
-    else:
-        print("No points to upsert.")
+# Jobs are deleted this many days after their deadline
+EXPIRY_GRACE_DAYS = 7
+# Jobs deleted per transaction, so the SQLite write lock is released between chunks
+DELETE_CHUNK_SIZE = 500
 
 @shared_task
-def remove_expired_jobs():
+def remove_expired_jobs(grace_days=EXPIRY_GRACE_DAYS, chunk_size=DELETE_CHUNK_SIZE):
     """
-    Removes jobs that are one week past their deadline.
+    Removes jobs that are more than `grace_days` past their deadline, together with
+    their JobMatch rows and Qdrant points. Rows are selected with a range query on the
+    indexed deadline_on column and deleted `chunk_size` at a time.
+    Returns a report with the counts and duration.
     """
-    now = datetime.now()
-    one_week_ago = now - timedelta(days=7)
-    expired_jobs = []
+    start = time.monotonic()
+    cutoff = timezone.localdate() - timedelta(days=grace_days)
+    expired = Job.objects.filter(deadline_on__lt=cutoff).order_by("id").values_list("id", flat=True)
 
-    for job in Job.objects.all():
-        deadline_str = job.deadline
-        if not deadline_str:
-            continue
-        try:
-            # Try parsing deadline as date
-            deadline_date = datetime.strptime(deadline_str, "%Y-%m-%d")
-        except Exception:
-            continue  # Skip if deadline format is invalid
-
-        if deadline_date < one_week_ago:
-            expired_jobs.append(job.id)
-            job.delete()
-
-    print(f"Removed {len(expired_jobs)} expired jobs: {expired_jobs}")
\ No newline at end of file
+    try:
+        qdrant = get_qdrant_client()
+    except Exception as e:
+        print("Qdrant unavailable, expired job vectors are left in place:", e)
+        qdrant = None
+
+    report = {"jobs": 0, "job_matches": 0, "qdrant_points": 0, "qdrant_errors": 0}
+    while True:
+        ids = list(expired[:chunk_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            _, per_model = Job.objects.filter(id__in=ids).delete()
+        report["jobs"] += per_model.get("job.Job", 0)
+        report["job_matches"] += per_model.get("job.JobMatch", 0)
+
+        if qdrant is not None:
+            try:
+                report["qdrant_points"] += delete_job_points(qdrant, ids)
+            except Exception as e:
+                print("Qdrant delete error:", e)
+                report["qdrant_errors"] += 1
+
+    report["cutoff"] = cutoff.isoformat()
+    report["seconds"] = round(time.monotonic() - start, 2)
+    print(
+        f"Removed {report['jobs']} expired jobs (deadline before {report['cutoff']}), "
+        f"{report['job_matches']} matches and {report['qdrant_points']} vectors in {report['seconds']}s."
+    )
+    return report
@@ -1,3 +1,151 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from user.models import UserProfile
+from .ingest import build_job
+from .models import Job, JobMatch
+from .normalize import parse_salary
+from .views import FEED_ORDER, after_cursor, decode_cursor, encode_cursor, rank_jobs
+
+
+class ParseSalaryTests(SimpleTestCase):
+    def assertSalary(self, args, minimum, maximum, currency):
+        expected = (
+            None if minimum is None else Decimal(minimum),
+            None if maximum is None else Decimal(maximum),
+            currency,
+        )
+        self.assertEqual(parse_salary(*args), expected)
+
+    def test_monthly_pay_ignores_working_hours(self):
+        self.assertSalary(("ETB 10,000 per month, 8 hours per day",), "10000", "10000", "ETB")
+
+    def test_monthly_pay_ignores_working_days(self):
+        self.assertSalary(("Birr 12,000 per month; 5 days a week",), "12000", "12000", "ETB")
+
+    def test_position_count_is_not_an_amount(self):
+        self.assertSalary(("ETB 5,000 for 3 positions",), "5000", "5000", "ETB")
+
+    def test_grade_is_not_an_amount(self):
+        self.assertSalary(("As per company scale (Grade 12)",), None, None, None)
+
+    def test_allowance_does_not_change_pay_period(self):
+        self.assertSalary(("$1,200 - $1,500 per month + $50 daily allowance",), "1200", "1500", "USD")
+
+    def test_yearly_range_with_k_suffix(self):
+        self.assertSalary(("$60k - $80k a year",), "5000", "6666.67", "USD")
+
+    def test_hourly_rate(self):
+        self.assertSalary(("$25/hour",), "4333.33", "4333.33", "USD")
+
+    def test_range_without_thousands_separators(self):
+        self.assertSalary(("ETB 10000 - 15000",), "10000", "15000", "ETB")
+
+    def test_space_separated_thousands(self):
+        self.assertSalary(("10 000 - 12 000 Br. monthly",), "10000", "12000", "ETB")
+
+    def test_min_and_max_fields(self):
+        self.assertSalary((None, "15000", "30000"), "15000", "30000", None)
+
+    def test_monthly_after_amount(self):
+        self.assertSalary(("ETB 10,000 monthly",), "10000", "10000", "ETB")
+        self.assertSalary(("$60,000 yearly",), "5000", "5000", "USD")
+
+    def test_monthly_after_range(self):
+        self.assertSalary(("ETB 10,000 - 15,000 monthly",), "10000", "15000", "ETB")
+
+    def test_period_away_from_amount_is_ignored(self):
+        self.assertSalary(("ETB 20,000 + annual bonus",), "20000", "20000", "ETB")
+        self.assertSalary(("ETB 9,000 with a daily lunch allowance",), "9000", "9000", "ETB")
+
+    def test_numbers_only(self):
+        self.assertSalary(("15000",), "15000", "15000", None)
+        self.assertSalary(("10000-15000",), "10000", "15000", None)
+
+    def test_period_in_label(self):
+        self.assertSalary(("Monthly salary: 12000",), "12000", "12000", None)
+        self.assertSalary(("Annual salary: $50,000 - $60,000",), "4166.67", "5000", "USD")
+
+    def test_min_and_max_fields_use_period_from_text(self):
+        self.assertSalary(("ETB 15,000 - 30,000 per year", "15000", "30000"), "1250", "2500", "ETB")
+
+    def test_no_amount(self):
+        self.assertSalary(("Negotiable",), None, None, None)
+
+
+class BuildJobTests(SimpleTestCase):
+    def test_values_that_do_not_fit_their_field_are_dropped(self):
+        job = build_job({
+            "description": "d",
+            "number_of_positions": "Several",
+            "requirements": {"gender": "Male", "agemin": "25", "agemax": -3},
+            "education_level": {"cgpa": "3.5/4"},
+            "job_type": "Full-time",
+            "contact_email": "not an email",
+        })
+        self.assertIsNone(job.number_of_positions)
+        self.assertIsNone(job.gender)
+        self.assertEqual(job.agemin, 25)
+        self.assertIsNone(job.agemax)
+        self.assertIsNone(job.cgpa)
+        self.assertEqual(job.job_type, "Full-time")
+        self.assertIsNone(job.contact_email)
+
+    def test_hiring_cafe_id_without_source(self):
+        job = build_job({"description": "d", "job_hc_id": "abc999"})
+        self.assertEqual((job.source, job.external_id), ("hiring_cafe", "abc999"))
+        self.assertEqual(job.job_link, "https://hiringcafe.com/abc999")
+
+    def test_required_fields_fall_back_to_defaults(self):
+        job = build_job({"category": "x" * 300})
+        self.assertEqual(job.description, "")
+        self.assertEqual(job.category, "Others")
+
+
+class CursorTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username="seeker")
+        self.profile = UserProfile.objects.create(user=user, first_name="A", last_name="B")
+        expired = date.today() - timedelta(days=1)
+        # Two deadline tiers, with tied match scores inside the open tier
+        scores = [80.0, 80.0, 80.0, 50.0, None, None, 90.0]
+        for i, score in enumerate(scores):
+            job = Job.objects.create(description="d", category="IT", deadline=expired.isoformat() if i == 6 else None)
+            if score is not None:
+                JobMatch.objects.create(user_profile=self.profile, job=job, match_percentage=score)
+
+    def ranked(self):
+        return rank_jobs(Job.objects.all(), self.profile, FEED_ORDER)
+
+    def test_round_trip(self):
+        job = SimpleNamespace(deadline_valid=True, match_score=80.0, id=3)
+        self.assertEqual(decode_cursor(encode_cursor(job, FEED_ORDER), FEED_ORDER), [True, 80.0, 3])
+
+    def test_invalid_cursor(self):
+        for cursor in ("garbage", encode_cursor(SimpleNamespace(deadline_valid=True, match_score=1.0), FEED_ORDER[:2])):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor, FEED_ORDER)
+
+    def test_pages_cover_ranking_once_with_ties(self):
+        expected = list(self.ranked().values_list("id", flat=True))
+        seen = []
+        page = list(self.ranked()[:2])
+        while page:
+            seen += [job.id for job in page]
+            page = list(after_cursor(self.ranked(), encode_cursor(page[-1], FEED_ORDER), FEED_ORDER)[:2])
+        self.assertEqual(seen, expected)
+
+    def test_ties_resume_by_id(self):
+        first, second, third = list(self.ranked()[:3])
+        self.assertEqual(first.match_score, third.match_score)
+        resumed = after_cursor(self.ranked(), encode_cursor(first, FEED_ORDER), FEED_ORDER).first()
+        self.assertEqual(resumed.id, second.id)
+
+    def test_expired_jobs_come_last(self):
+        last = list(self.ranked())[-1]
+        self.assertFalse(last.deadline_valid)
+        self.assertEqual(list(after_cursor(self.ranked(), encode_cursor(last, FEED_ORDER), FEED_ORDER)), [])
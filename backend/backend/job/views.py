@@ -1,11 +1,19 @@
 from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
 from .models import Job, JobMatch
+from .ingest import save_jobs
+from .matching import match_jobs_for_profile, save_matches
+from .search import full_text_search, hybrid_search
 from django.core.paginator import Paginator
+from django.db.models import BooleanField, Case, FloatField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.views.decorators.http import require_GET
 from django.views.decorators.csrf import csrf_exempt
 from .form_agent import fill_google_form
+import base64
 import json
+from decimal import Decimal
 import os
 import asyncio
 from django.contrib.auth.models import User
@@ -13,8 +21,6 @@ from user.models import UserProfile, RecruiterProfile
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from datetime import datetime
-import random  # Add this import at the top
 
 def import_jobs_from_json(request):
     # Hardcoded path to the locally stored JSON file
@@ -26,69 +32,187 @@ def import_jobs_from_json(request):
         data = json.load(f)
 
     jobs = data.get("jobs", [])
-    imported = 0
-    for job in jobs:
-        # Skip jobs missing required fields
-        if not job.get("description") or not job.get("category"):
-            continue
-
-        requirements = job.get("requirements", {})
-        education_level = job.get("education_level", {})
-
-        Job.objects.create(
-            title=job.get("title"),
-            company=job.get("company"),
-            description=job.get("description"),
-            gender=requirements.get("gender"),
-            agemax=requirements.get("agemax"),
-            agemin=requirements.get("agemin"),
-            other_requirements=requirements.get("other"),
-            skills=requirements.get("skills"),
-            is_online=job.get("isOnline"),
-            is_remote=job.get("is_remote"),
-            location=job.get("location"),
-            country=job.get("country"),
-            city=job.get("city"),
-            address=job.get("address"),
-            salary=job.get("salary"),
-            salary_min=job.get("salary_min"),
-            salary_max=job.get("salary_max"),
-            deadline=job.get("deadline"),
-            job_type=job.get("job_type"),
-            category=job.get("category"),
-            posted_date=job.get("posted_date"),
-            experience_level=job.get("experience_level"),
-            degree_required=education_level.get("degree_required"),
-            cgpa=education_level.get("cgpa"),
-            contact_email=job.get("contact_email"),
-            contact_phone=job.get("contact_phone"),
-            application_method=job.get("application_method"),
-            application_instructions=job.get("application_instructions"),
-            application_url=job.get("application_url"),
-            number_of_positions=job.get("number_of_positions"),
-            tags=job.get("tags"),
-            job_link=job.get("job_link"),
-        )
-        imported += 1
+    # Skip jobs missing required fields
+    valid_jobs = [job for job in jobs if job.get("description") and job.get("category")]
+    # Upsert on (source, external_id) so re-importing the same file doesn't duplicate jobs
+    imported = len(save_jobs(valid_jobs, upsert=True))
 
     return JsonResponse({"imported": imported, "total": len(jobs)})
 
-def is_deadline_passed(deadline_str):
-    if not deadline_str:
-        return False
+def with_match_percentage(jobs_qs, user_profile):
+    """
+    Annotates each job with the user's JobMatch.match_percentage (None when unmatched)
+    using a correlated subquery, so the scores come back in the same query as the jobs.
+    """
+    if user_profile is None:
+        return jobs_qs.annotate(match_percentage=Value(None, output_field=FloatField()))
+    match = JobMatch.objects.filter(user_profile=user_profile, job=OuterRef("pk")).values("match_percentage")[:1]
+    return jobs_qs.annotate(match_percentage=Subquery(match, output_field=FloatField()))
+
+# Ranking keys as (annotation, descending). The last key must be unique (id) so
+# the ranking is a total order and can be resumed from a cursor.
+FEED_ORDER = [("deadline_valid", True), ("match_score", True), ("id", False)]
+# Search results rank by text relevance within each deadline tier
+SEARCH_ORDER = [("deadline_valid", True), ("search_score", True), ("match_score", True), ("id", False)]
+# Currency assumed by the salary_min / salary_max search filters when none is given
+SALARY_DEFAULT_CURRENCY = "ETB"
+
+def rank_jobs(jobs_qs, user_profile, order=FEED_ORDER):
+    """
+    Orders jobs for the feed: jobs whose deadline hasn't passed (or is unknown) first,
+    then by the user's match percentage (unmatched last), then by id.
+    Pass SEARCH_ORDER for a queryset annotated with `search_score`.
+    """
+    today = timezone.localdate()
+    return with_match_percentage(jobs_qs, user_profile).annotate(
+        deadline_valid=Case(
+            When(deadline_on__lt=today, then=Value(False)),
+            default=Value(True),
+            output_field=BooleanField(),
+        ),
+        match_score=Coalesce("match_percentage", Value(-1.0), output_field=FloatField()),
+    ).order_by(*[f"-{field}" if descending else field for field, descending in order])
+
+def job_summary(job):
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "skills": job.skills,
+        "is_online": job.is_online,
+        "is_remote": job.is_remote,
+        "location": job.location,
+        "country": job.country,
+        "city": job.city,
+        "salary": job.salary,
+        "deadline": job.deadline,
+        "category": job.category,
+        "posted_date": job.posted_date,
+        "tags": job.tags,
+        "job_link": job.job_link,
+        "salary_min_monthly": _as_float(job.salary_min_monthly),
+        "salary_max_monthly": _as_float(job.salary_max_monthly),
+        "salary_currency": job.salary_currency,
+        "match_percentage": job.match_percentage,
+    }
+
+def _as_float(value):
+    return float(value) if value is not None else None
+
+def salary_filter(params):
+    """
+    Builds the salary filter for jobs_search from `salary_min` / `salary_max` (monthly
+    amounts) and `currency`. A job matches when its monthly range overlaps the requested
+    one; jobs without a parsed salary are excluded once any salary filter is given.
+    Amounts are compared in `currency`; without one, jobs in SALARY_DEFAULT_CURRENCY
+    or with no parsed currency match.
+    Raises ValueError for amounts that are not finite numbers.
+    """
+    condition = Q()
+    amounts = {}
+    for param in ("salary_min", "salary_max"):
+        if params.get(param):
+            amounts[param] = Decimal(params[param])
+            if not amounts[param].is_finite():
+                raise ValueError(f"{param} must be a finite number.")
+    if "salary_min" in amounts:
+        condition &= Q(salary_max_monthly__gte=amounts["salary_min"])
+    if "salary_max" in amounts:
+        condition &= Q(salary_min_monthly__lte=amounts["salary_max"])
+    currency = params.get("currency", "").strip().upper()
+    if currency:
+        condition &= Q(salary_currency=currency)
+    elif amounts:
+        # Amounts parsed without a currency marker are mostly from the Ethiopian sites
+        condition &= Q(salary_currency=SALARY_DEFAULT_CURRENCY) | Q(salary_currency__isnull=True)
+    return condition
+
+def encode_cursor(job, order):
+    """
+    Opaque cursor for the position just after `job` in the given ranking.
+    """
+    key = [getattr(job, field) for field, _ in order]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor, order):
     try:
-        # Example format: "September 10, 2025"
-        return datetime.strptime(deadline_str, "%B %d, %Y") < datetime.now()
-    except Exception:
-        return False
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        key = None
+    if not isinstance(key, list) or len(key) != len(order) or not all(isinstance(v, (int, float)) for v in key):
+        raise ValueError("Invalid cursor.")
+    return key
+
+def after_cursor(ranked, cursor, order):
+    """
+    Keeps the jobs ranked after the cursor position: worse on the first key, or equal
+    on the first key and worse on the second, and so on down to the id.
+    """
+    condition = Q()
+    equal = {}
+    for (field, descending), value in zip(order, decode_cursor(cursor, order)):
+        condition |= Q(**equal, **{f"{field}__{'lt' if descending else 'gt'}": value})
+        equal[field] = value
+    return ranked.filter(condition)
+
+def positive_int(params, name, default):
+    """
+    Reads an integer query parameter that must be at least 1. Raises ValueError otherwise.
+    """
+    try:
+        value = int(params.get(name, default))
+    except (TypeError, ValueError):
+        value = 0
+    if value < 1:
+        raise ValueError(f"{name} must be a positive integer.")
+    return value
+
+def paginated_jobs_response(request, jobs_qs, user_profile, order=FEED_ORDER):
+    """
+    Returns one page of ranked jobs. With a `cursor` parameter the page starts right
+    after the cursor (keyset pagination, stable while new jobs arrive); otherwise
+    `page` selects it by offset. Both modes return a `next_cursor` (None on the last page).
+    """
+    try:
+        page_size = positive_int(request.GET, "page_size", 10)
+        page = positive_int(request.GET, "page", 1)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    ranked = rank_jobs(jobs_qs.defer("description"), user_profile, order)
+
+    cursor = request.GET.get("cursor")
+    if cursor:
+        try:
+            ranked = after_cursor(ranked, cursor, order)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        jobs = list(ranked[:page_size + 1])
+        has_more = len(jobs) > page_size
+        jobs = jobs[:page_size]
+        return JsonResponse({
+            "jobs": [job_summary(job) for job in jobs],
+            "page_size": page_size,
+            "next_cursor": encode_cursor(jobs[-1], order) if has_more else None,
+        })
+
+    # Rank and slice in the database so only one page of rows is fetched
+    total_jobs = jobs_qs.count()
+    start = (page - 1) * page_size
+    jobs = list(ranked[start:start + page_size])
+    total_pages = (total_jobs + page_size - 1) // page_size
+
+    return JsonResponse({
+        "jobs": [job_summary(job) for job in jobs],
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "next_cursor": encode_cursor(jobs[-1], order) if jobs and page < total_pages else None,
+    })
 
 @api_view(['GET'])
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
 def jobs_feed(request):
-    page = int(request.GET.get("page", 1))
-    page_size = int(request.GET.get("page_size", 10))
-
     user_profile = None
     if request.user.is_authenticated:
         try:
@@ -97,54 +221,7 @@ def jobs_feed(request):
             user_profile = None
 
     jobs_qs = Job.objects.all()
-    jobs_list = []
-    for job in jobs_qs:
-        match_percentage = None
-        if user_profile:
-            job_match = JobMatch.objects.filter(user_profile=user_profile, job=job).first()
-            if job_match:
-                match_percentage = float(job_match.match_percentage)
-        jobs_list.append({
-            "id": job.id,
-            "title": job.title,
-            "company": job.company,
-            "skills": job.skills,
-            "is_online": job.is_online,
-            "is_remote": job.is_remote,
-            "location": job.location,
-            "country": job.country,
-            "city": job.city,
-            "salary": job.salary,
-            "deadline": job.deadline,
-            "category": job.category,
-            "posted_date": job.posted_date,
-            "tags": job.tags,
-            "job_link": job.job_link,
-            "match_percentage": match_percentage,
-        })
-
-    # Sort jobs: valid deadline first, then by match_percentage (descending), then outdated jobs last
-    jobs_list.sort(
-        key=lambda x: (
-            not is_deadline_passed(x["deadline"]),  # True (valid) comes first
-            x["match_percentage"] if x["match_percentage"] is not None else -1  # Descending match
-        ),
-        reverse=True
-    )
-
-    # Paginate after sorting
-    total_jobs = len(jobs_list)
-    start = (page - 1) * page_size
-    end = start + page_size
-    paginated_jobs = jobs_list[start:end]
-    total_pages = (total_jobs + page_size - 1) // page_size
-
-    return JsonResponse({
-        "jobs": paginated_jobs,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": total_pages,
-    })
+    return paginated_jobs_response(request, jobs_qs, user_profile)
 
 
 @api_view(['GET'])
@@ -183,6 +260,9 @@ def job_details(request, job_id):
         "salary": job.salary,
         "salary_min": job.salary_min,
         "salary_max": job.salary_max,
+        "salary_min_monthly": _as_float(job.salary_min_monthly),
+        "salary_max_monthly": _as_float(job.salary_max_monthly),
+        "salary_currency": job.salary_currency,
         "deadline": job.deadline,
         "job_type": job.job_type,
         "category": job.category,
@@ -292,21 +372,17 @@ def match_all_jobs_for_user(request):
     except UserProfile.DoesNotExist:
         return JsonResponse({"error": "User profile not found."}, status=404)
 
-    user_dict = {
-        "skills": user_profile.skills,
-        "experience": user_profile.experience,
-        "job_title": user_profile.job_title,
-        "bio": user_profile.bio,
-        "preferred_locations": user_profile.preferred_locations,
-        "job_types": user_profile.job_types,
-        "linkedin_url": user_profile.linkedin_url,
-        "portfolio_url": user_profile.portfolio_url,
-    }
+    try:
+        matches = match_jobs_for_profile(user_profile)
+    except Exception as e:
+        print(f"Matching failed for user {request.user.id}:", repr(e))
+        return JsonResponse({"error": "Matching is temporarily unavailable."}, status=503)
 
-    jobs = Job.objects.all()[:130]  # Only first 130 jobs
-    jobs_list = []
-    for job in jobs:
-        jobs_list.append({
+    scaled_matches = []
+    for job, match_percentage in matches:
+        scaled_matches.append({
+            "job_id": job.id,
+            "match_percentage": match_percentage,
             "id": job.id,
             "skills": job.skills,
             "experience_level": job.experience_level,
@@ -322,30 +398,7 @@ def match_all_jobs_for_user(request):
             "tags": job.tags,
         })
 
-    # Generate random match percentages between 75 and 95
-    scaled_matches = []
-    for job in jobs_list:
-        match_percentage = round(random.uniform(75, 95), 2)
-        scaled_matches.append({
-            "job_id": job["id"],
-            "match_percentage": match_percentage,
-            **job
-        })
-
-    created = 0
-    for match in scaled_matches:
-        job_id = match["job_id"]
-        percentage = match["match_percentage"]
-        job_obj = Job.objects.get(id=job_id)
-        obj, exists = JobMatch.objects.get_or_create(
-            user_profile=user_profile,
-            job=job_obj,
-            defaults={"match_percentage": percentage}
-        )
-        if not exists:
-            obj.match_percentage = percentage
-            obj.save()
-        created += 1
+    created = save_matches(user_profile, [(m["job_id"], m["match_percentage"]) for m in scaled_matches])
 
     return JsonResponse({
         "created_or_updated": created,
@@ -356,8 +409,6 @@ def match_all_jobs_for_user(request):
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
 def jobs_search(request):
-    page = int(request.GET.get("page", 1))
-    page_size = int(request.GET.get("page_size", 10))
     search_term = request.GET.get("search_term", "").strip().lower()
 
     user_profile = None
@@ -367,66 +418,16 @@ def jobs_search(request):
         except UserProfile.DoesNotExist:
             user_profile = None
 
-    jobs_qs = Job.objects.all()
-    if search_term:
-        jobs_qs = jobs_qs.filter(
-            title__icontains=search_term
-        ) | jobs_qs.filter(
-            company__icontains=search_term
-        ) | jobs_qs.filter(
-            category__icontains=search_term
-        ) | jobs_qs.filter(
-            skills__icontains=search_term
-        )
-
-    jobs_list = []
-    for job in jobs_qs:
-        match_percentage = None
-        if user_profile:
-            job_match = JobMatch.objects.filter(user_profile=user_profile, job=job).first()
-            if job_match:
-                match_percentage = float(job_match.match_percentage)
-        jobs_list.append({
-            "id": job.id,
-            "title": job.title,
-            "company": job.company,
-            "skills": job.skills,
-            "is_online": job.is_online,
-            "is_remote": job.is_remote,
-            "location": job.location,
-            "country": job.country,
-            "city": job.city,
-            "salary": job.salary,
-            "deadline": job.deadline,
-            "category": job.category,
-            "posted_date": job.posted_date,
-            "tags": job.tags,
-            "job_link": job.job_link,
-            "match_percentage": match_percentage,
-        })
-
-    # Sort jobs: valid deadline first, then by match_percentage (descending), then outdated jobs last
-    jobs_list.sort(
-        key=lambda x: (
-            not is_deadline_passed(x["deadline"]),
-            x["match_percentage"] if x["match_percentage"] is not None else -1
-        ),
-        reverse=True
-    )
-
-    # Paginate after sorting
-    total_jobs = len(jobs_list)
-    start = (page - 1) * page_size
-    end = start + page_size
-    paginated_jobs = jobs_list[start:end]
-    total_pages = (total_jobs + page_size - 1) // page_size
-
-    return JsonResponse({
-        "jobs": paginated_jobs,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": total_pages,
-    })
+    try:
+        jobs_qs = Job.objects.filter(salary_filter(request.GET))
+    except (ArithmeticError, ValueError):
+        return JsonResponse({"error": "salary_min and salary_max must be finite numbers."}, status=400)
+    if not search_term:
+        return paginated_jobs_response(request, jobs_qs, user_profile)
+    # mode=hybrid also ranks by embedding similarity, so related titles match
+    if request.GET.get("mode") == "hybrid":
+        return paginated_jobs_response(request, hybrid_search(jobs_qs, search_term), user_profile, SEARCH_ORDER)
+    return paginated_jobs_response(request, full_text_search(jobs_qs, search_term), user_profile, SEARCH_ORDER)
 
 @api_view(['POST'])
 @authentication_classes([JWTAuthentication])
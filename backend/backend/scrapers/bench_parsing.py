@@ -0,0 +1,68 @@
+"""
+Benchmarks the scraper parse functions on the saved fixture pages in scrapers/fixtures.
+Reports pages parsed per second for every available parser backend and checks the
+output matches the html.parser baseline.
+
+Usage (from the backend directory):
+    python -m scrapers.bench_parsing [--iterations 200]
+"""
+import argparse
+import time
+from pathlib import Path
+
+from . import effoysira, ethiojobs, hamerejobs
+from .parsing import PARSER_BACKENDS, get_parser, set_parser
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# (fixture file, parse function) for each site's listing and detail markup
+CASES = [
+    ("effoysira_listing.html", effoysira.get_job_links),
+    ("effoysira_detail.html", effoysira.parse_job_details),
+    ("ethiojobs_listing.html", ethiojobs.get_job_posts),
+    ("ethiojobs_detail.html", ethiojobs.parse_job_details),
+    ("hamerejobs_listing.html", hamerejobs.get_job_links),
+    ("hamerejobs_detail.html", hamerejobs.parse_job_details),
+]
+
+def available_backends():
+    backends = []
+    for name in PARSER_BACKENDS:
+        try:
+            __import__({"lxml": "lxml", "html5lib": "html5lib"}.get(name, "html.parser"))
+        except ImportError:
+            continue
+        backends.append(name)
+    return backends
+
+def pages_per_second(parse, html, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(html)
+    return iterations / (time.perf_counter() - start)
+
+def run(iterations=200):
+    backends = available_backends()
+    original = get_parser()
+    print(f"{'fixture':<26}" + "".join(f"{name:>14}" for name in backends) + "   (pages/s)")
+    try:
+        for fixture, parse in CASES:
+            html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+            set_parser("html.parser")
+            baseline = parse(html)
+            row = []
+            for name in backends:
+                set_parser(name)
+                rate = pages_per_second(parse, html, iterations)
+                mark = "" if parse(html) == baseline else "*"
+                row.append(f"{rate:>13.1f}{mark or ' '}")
+            print(f"{fixture:<26}" + "".join(row))
+    finally:
+        set_parser(original)
+    print("* output differs from the html.parser baseline")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    run(args.iterations)
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from .session import get_session, REQUEST_TIMEOUT
+
+CACHE_DIR = Path(os.getenv("SCRAPER_CACHE_DIR", Path(__file__).resolve().parent.parent / ".scraper_cache"))
+# Set SCRAPER_HTTP_CACHE=0 to always download every page in full.
+HTTP_CACHE_ENABLED = os.getenv("SCRAPER_HTTP_CACHE", "1") != "0"
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPER_HTTP_CACHE_MAX_ENTRIES", "20000"))
+HTTP_CACHE_MAX_AGE_DAYS = int(os.getenv("SCRAPER_HTTP_CACHE_MAX_AGE_DAYS", "30"))
+
+CachedPage = namedtuple("CachedPage", ["text", "unchanged"])
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class PageCache:
+    """
+    On-disk cache of raw page bodies keyed by URL, together with the validators
+    (ETag / Last-Modified) and a content hash from the last download.
+    Pages not fetched for max_age_days are evicted first, then the least recently
+    fetched ones beyond max_entries.
+    """
+
+    def __init__(self, path=None, max_entries=HTTP_CACHE_MAX_ENTRIES, max_age_days=HTTP_CACHE_MAX_AGE_DAYS):
+        path = Path(path or CACHE_DIR / "pages.sqlite3")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pages_fetched_at ON pages (fetched_at)")
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_hash, body FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "content_hash": row[2], "body": row[3]}
+
+    def put(self, url, body, etag=None, last_modified=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, content_hash, body, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, content_hash(body), body, time.time()),
+            )
+
+    def touch(self, url):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def evict(self):
+        """
+        Drops stale and least recently fetched pages. Returns how many were removed.
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM pages WHERE fetched_at < ?", (cutoff,)).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM pages WHERE url NOT IN (SELECT url FROM pages ORDER BY fetched_at DESC LIMIT ?)",
+                (self.max_entries,),
+            ).rowcount
+        return removed
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+def get_page_cache():
+    global _page_cache
+    if _page_cache is None:
+        with _page_cache_lock:
+            if _page_cache is None:
+                _page_cache = PageCache()
+    return _page_cache
+
+def conditional_get(url, headers=None):
+    """
+    GETs `url` with If-None-Match / If-Modified-Since from the cached copy.
+    Returns CachedPage(text, unchanged): unchanged is True when the server answered
+    304 Not Modified or sent back a body identical to the cached one.
+    """
+    if not HTTP_CACHE_ENABLED:
+        response = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return CachedPage(response.text, False)
+
+    cache = get_page_cache()
+    cached = cache.get(url)
+    request_headers = dict(headers or {})
+    if cached:
+        if cached["etag"]:
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = get_session().get(url, headers=request_headers, timeout=REQUEST_TIMEOUT)
+    if cached and response.status_code == 304:
+        cache.touch(url)
+        return CachedPage(cached["body"], True)
+    response.raise_for_status()
+
+    text = response.text
+    unchanged = cached is not None and cached["content_hash"] == content_hash(text)
+    cache.put(url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return CachedPage(text, unchanged)
+
+# --- Structured job cache ---
+# Set SCRAPER_LLM_CACHE=0 to send every raw job to Gemini again.
+LLM_CACHE_ENABLED = os.getenv("SCRAPER_LLM_CACHE", "1") != "0"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPER_LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_MAX_AGE_DAYS = int(os.getenv("SCRAPER_LLM_CACHE_MAX_AGE_DAYS", "90"))
+
+# Raw fields that identify where a posting was seen rather than what it says
+_VOLATILE_FIELDS = {"url", "link", "job_link", "id", "job_hc_id", "index", "source", "apply_url"}
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return " ".join(f"{k}:{_normalize(v)}" for k, v in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return " ".join(_normalize(v) for v in value)
+    return " ".join(str(value).casefold().split())
+
+def prompt_version(prompt_template):
+    return hashlib.sha256(prompt_template.encode("utf-8")).hexdigest()[:16]
+
+def structured_cache_key(raw_job, prompt_template):
+    """
+    Hash of the normalized raw job text plus the prompt version. Links, ids and the
+    source are left out, so the same posting on a mirror site maps to the same key.
+    """
+    content = {k: v for k, v in raw_job.items() if k not in _VOLATILE_FIELDS and v not in (None, "", [])}
+    return content_hash(prompt_version(prompt_template) + "\n" + _normalize(content))
+
+class StructuredJobCache:
+    """
+    Persistent cache of Gemini-structured jobs keyed by structured_cache_key.
+    A raw posting can map to several structured jobs (or none, if Gemini rejected it),
+    so each value is a list. Entries unused for max_age_days are evicted first,
+    then the least recently used ones beyond max_entries.
+    """
+
+    def __init__(self, path=None, max_entries=LLM_CACHE_MAX_ENTRIES, max_age_days=LLM_CACHE_MAX_AGE_DAYS):
+        path = Path(path or CACHE_DIR / "structured.sqlite3")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS structured_jobs (
+                    key TEXT PRIMARY KEY,
+                    jobs TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS structured_jobs_last_used ON structured_jobs (last_used_at)"
+            )
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT jobs FROM structured_jobs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute("UPDATE structured_jobs SET last_used_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key, jobs):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO structured_jobs (key, jobs, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(jobs, ensure_ascii=False), now, now),
+            )
+
+    def evict(self):
+        """
+        Drops stale and least recently used entries. Returns how many were removed.
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM structured_jobs WHERE last_used_at < ?", (cutoff,)).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM structured_jobs WHERE key NOT IN "
+                "(SELECT key FROM structured_jobs ORDER BY last_used_at DESC LIMIT ?)",
+                (self.max_entries,),
+            ).rowcount
+        return removed
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM structured_jobs").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+_structured_cache = None
+
+def get_structured_cache():
+    global _structured_cache
+    if _structured_cache is None:
+        with _page_cache_lock:
+            if _structured_cache is None:
+                _structured_cache = StructuredJobCache()
+    return _structured_cache
@@ -1,6 +1,6 @@
-import requests
-from bs4 import BeautifulSoup
-import time
+from .fetcher import fetch_details, fetch_page
+from .session import get_session, REQUEST_TIMEOUT
+from .parsing import make_soup
 BASE_URL = "https://ethiojobs.com.et/?page={}"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -10,7 +10,7 @@ HEADERS = {
 }
 
 def get_job_posts(html):
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     jobs = []
     for post in soup.select("div.job-post-item"):
         job = {}
@@ -31,7 +31,7 @@ def get_job_posts(html):
     return jobs
 
 def parse_job_details(html):
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     content_divs = soup.find_all("div", class_="post-content")
     all_text = []
     for div in content_divs:
@@ -45,22 +45,15 @@ def scrape_jobs_until_page(last_page):
     for page in range(1, last_page + 1):
         url = BASE_URL.format(page)
         print(f"Scraping page {page}: {url}")
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
-        jobs = get_job_posts(response.text)
-        for job in jobs:
-            link = job.get("link")
-            if not link:
-                continue
-            try:
-                resp = requests.get(link, headers=HEADERS)
-                resp.raise_for_status()
-                job_info = parse_job_details(resp.text)
-                job_info["url"] = link
+        jobs = get_job_posts(fetch_page(url, headers=HEADERS))
+        links = [job["link"] for job in jobs if job.get("link")]
+        for result in fetch_details(links, parse_job_details, headers=HEADERS):
+            if result.error is not None:
+                print(f"Failed to scrape {result.url}: {result.error}")
+            else:
+                job_info = result.data
+                job_info["url"] = result.url
                 all_jobs.append(job_info)
-                time.sleep(1)
-            except Exception as e:
-                print(f"Failed to scrape {link}: {e}")
     return all_jobs
 
 def scrape_jobs_until_job(target_job_link=None, max_pages=100, num_jobs=None):
@@ -74,28 +67,26 @@ def scrape_jobs_until_job(target_job_link=None, max_pages=100, num_jobs=None):
     for page in range(1, max_pages + 1):
         url = BASE_URL.format(page)
         print(f"Scraping page {page}: {url}")
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
-        jobs = get_job_posts(response.text)
-        for job in jobs:
-            link = job.get("link")
-            if not link:
-                continue
-            try:
-                resp = requests.get(link, headers=HEADERS)
-                resp.raise_for_status()
-                job_info = parse_job_details(resp.text)
-                job_info["url"] = link
+        jobs = get_job_posts(fetch_page(url, headers=HEADERS))
+        links = [job["link"] for job in jobs if job.get("link")]
+        # Don't fetch past the target job or beyond the number of jobs still needed
+        if target_job_link and target_job_link in links:
+            links = links[:links.index(target_job_link) + 1]
+        elif num_jobs and not target_job_link:
+            links = links[:num_jobs - len(all_jobs)]
+        for result in fetch_details(links, parse_job_details, headers=HEADERS):
+            if result.error is not None:
+                print(f"Failed to scrape {result.url}: {result.error}")
+            else:
+                job_info = result.data
+                job_info["url"] = result.url
                 all_jobs.append(job_info)
-                if target_job_link and link == target_job_link:
-                    found = True
-                    break
-                if num_jobs and not target_job_link and len(all_jobs) >= num_jobs:
-                    found = True
-                    break
-                time.sleep(1)
-            except Exception as e:
-                print(f"Failed to scrape {link}: {e}")
+            if target_job_link and result.url == target_job_link:
+                found = True
+                break
+            if num_jobs and not target_job_link and len(all_jobs) >= num_jobs:
+                found = True
+                break
         if found:
             if target_job_link:
                 print(f"Found target job: {target_job_link}")
@@ -111,7 +102,7 @@ def scrape_single_ethiojobs_job(details_url):
     Returns a dictionary with the job details.
     """
     try:
-        response = requests.get(details_url, headers=HEADERS)
+        response = get_session().get(details_url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         # Save HTML locally
         filename = "ethiojobs_job_test.html"
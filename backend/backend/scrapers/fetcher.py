@@ -0,0 +1,56 @@
+import asyncio
+import os
+from collections import namedtuple
+
+from .cache import conditional_get
+from .ratelimit import get_domain_bucket
+
+# Maximum number of detail requests in flight per fetch_details call.
+DEFAULT_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "4"))
+
+FetchResult = namedtuple("FetchResult", ["url", "data", "error", "unchanged"])
+
+def fetch_page(url, headers=None):
+    """
+    Fetches a single page (conditionally, through the page cache), waiting for the
+    domain's rate limit first. Returns the page text, cached or fresh.
+    """
+    get_domain_bucket(url).wait()
+    return conditional_get(url, headers).text
+
+def _fetch_and_parse_sync(url, parse, headers, skip_unchanged):
+    page = conditional_get(url, headers)
+    if page.unchanged and skip_unchanged:
+        return FetchResult(url, None, None, True)
+    return FetchResult(url, parse(page.text), None, page.unchanged)
+
+async def _fetch_and_parse(url, parse, headers, skip_unchanged, semaphore):
+    async with semaphore:
+        await get_domain_bucket(url).acquire()
+        try:
+            return await asyncio.to_thread(_fetch_and_parse_sync, url, parse, headers, skip_unchanged)
+        except Exception as e:
+            return FetchResult(url, None, e, False)
+
+async def fetch_details_async(urls, parse, headers=None, concurrency=DEFAULT_CONCURRENCY, skip_unchanged=False):
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(
+        *(_fetch_and_parse(url, parse, headers, skip_unchanged, semaphore) for url in urls)
+    )
+
+def fetch_details(urls, parse, headers=None, concurrency=DEFAULT_CONCURRENCY, skip_unchanged=False):
+    """
+    Fetches every url and runs parse(html) on it, keeping up to `concurrency` requests
+    in flight while respecting each domain's token bucket.
+    Returns a list of FetchResult(url, data, error, unchanged) in the same order as `urls`;
+    a failed fetch or parse has data=None and the exception in `error`.
+    With skip_unchanged=True, pages that have not changed since the last run are not
+    parsed and come back with data=None and unchanged=True. The scrapers leave it off:
+    an unchanged page may never have been saved (a failed Gemini batch or DB write),
+    so they re-parse it and rely on the DB link check and the structured cache instead.
+    """
+    if not urls:
+        return []
+    return asyncio.run(fetch_details_async(
+        urls, parse, headers=headers, concurrency=concurrency, skip_unchanged=skip_unchanged
+    ))
@@ -1,4 +1,4 @@
-import requests
+from .session import get_session, REQUEST_TIMEOUT
 import time
 
 url = "https://hiring.cafe/api/search-jobs"
@@ -127,7 +127,7 @@ def safe_get(d, *keys):
 
 def fetch_jobs(page):
     data["page"] = page
-    response = requests.post(url, headers=headers, cookies=cookies, json=data)
+    response = get_session().post(url, headers=headers, cookies=cookies, json=data, timeout=REQUEST_TIMEOUT)
     response_json = response.json()
     results = response_json.get("results", [])
     jobs = []
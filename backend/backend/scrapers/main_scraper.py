@@ -1,16 +1,20 @@
-import time
 import os
 import re
 import json
+import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 from .effoysira import scrape_jobs_until_job as effoysira_scrape
 from .ethiojobs import scrape_jobs_until_job as ethiojobs_scrape
 from .hamerejobs import scrape_jobs_until_job as hamerejobs_scrape
 from .hiring_cafe import scrape_jobs_until_job as hiring_cafe_scrape
+from .cache import HTTP_CACHE_ENABLED, LLM_CACHE_ENABLED, get_page_cache, get_structured_cache, structured_cache_key
+from .ratelimit import TokenBucket
 
 import google.generativeai as genai
+from google.api_core.exceptions import ServiceUnavailable, TooManyRequests
 
 # --- Data Models ---
 from enum import Enum
@@ -116,6 +120,39 @@ def batch_jobs(jobs, batch_size):
     for i in range(0, len(jobs), batch_size):
         yield jobs[i:i+batch_size]
 
+def scrape_sources(sources, concurrent=True):
+    """
+    Runs each source's scrape function and returns a dict of source name -> jobs.
+    With concurrent=True every source gets its own worker thread, so the total time
+    is roughly that of the slowest site. Each scraper keeps its own per-host delays,
+    so politeness towards a single site is unchanged.
+    """
+    results = {}
+    if not concurrent:
+        for name, scrape in sources.items():
+            results[name] = _run_source(name, scrape)
+        return results
+
+    with ThreadPoolExecutor(max_workers=len(sources) or 1, thread_name_prefix="scraper") as executor:
+        futures = {executor.submit(_run_source, name, scrape): name for name, scrape in sources.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            results[name] = future.result()
+            print(f"Finished scraping {name}: {len(results[name])} jobs")
+    return results
+
+def _run_source(name, scrape):
+    try:
+        jobs = scrape() or []
+    except Exception as e:
+        print(f"Failed to scrape source {name}: {e}")
+        return []
+    # Tag every raw job with the source it came from
+    for job in jobs:
+        if isinstance(job, dict):
+            job.setdefault("source", name)
+    return jobs
+
 def ask_gemini(prompt):
     api_key = os.getenv("API_KEY")
     genai.configure(api_key=api_key)
@@ -128,58 +165,8 @@ def ask_gemini(prompt):
             return part.text
     return "Sorry, I couldn't generate a response."
 
-# --- Main Scraper Class ---
-class MainScraper:
-    """
-    Scrapes multiple job sites until the last scraped value for each,
-    then enhances/structures the jobs using Gemini LLM.
-    """
-
-    def scrape_all(self, last_scraped_dict, max_pages=10, batch_size=5, rate_limit_seconds=4, num_jobs=None):
-        """
-        Scrapes all jobs, enhances them with Gemini, and returns structured jobs as a dict.
-        Does NOT save to any file.
-        """
-        # Step 1: Scrape raw jobs
-        results = {}
-
-        # Scrape from each source
-        results["effoysira"] = effoysira_scrape(num_jobs=num_jobs)
-        results["ethiojobs"] = ethiojobs_scrape(num_jobs=num_jobs)
-        results["hamerejobs"] = hamerejobs_scrape(num_jobs=num_jobs)
-        results["hiring_cafe"] = hiring_cafe_scrape(None, max_pages, pages_to_fetch=1)[:num_jobs]
-
-        # Separate hiring_cafe jobs for special processing
-        hiring_cafe_jobs = results.pop("hiring_cafe", [])
-        # Combine all other jobs into one flat list
-        raw_jobs = []
-        for jobs in results.values():
-            if isinstance(jobs, list):
-                for job in jobs:
-                    if isinstance(job, list):
-                        raw_jobs.extend(job)
-                    else:
-                        raw_jobs.append(job)
-            else:
-                raw_jobs.append(jobs)
-        print(f"Total jobs scraped (excluding hiring_cafe): {len(raw_jobs)}")
-        print(f"Total hiring_cafe jobs scraped: {len(hiring_cafe_jobs)}")
-
-        all_structured_jobs = []
-
-        # --- Process non-hiring_cafe jobs ---
-        for batch_num, jobs_batch in enumerate(batch_jobs(raw_jobs, batch_size), start=1):
-            print(f"Processing batch {batch_num} (non-hiring_cafe) with {len(jobs_batch)} jobs...")
-
-            indexed_batch = []
-            for idx, job in enumerate(jobs_batch):
-                job_with_index = dict(job)
-                job_with_index["index"] = idx
-                job_with_index["job_link"] = job.get("job_link") or job.get("url")
-                job_with_index["source"] = job.get("source", "other")
-                indexed_batch.append(job_with_index)
-
-            prompt = """
+# --- Prompts ---
+STRUCTURE_PROMPT = """
 You are an expert AI job data structurer and editor. Your job is to take a list of raw job postings (as Python dicts) and convert them into a JSON object with a single key 'jobs', whose value is a list of job objects.
 
 For each job:
@@ -286,38 +273,9 @@ Here is the data:
 {indexed_batch}
 Return only a valid JSON string, with no code block, no Python code, and no variable assignment.
 """
-            structured = ask_gemini(prompt.format(indexed_batch=indexed_batch))
-            print("Structured data for batch", batch_num)
-            # print(structured)
-
-            try:
-                json_str = extract_json(structured)
-                json_str = clean_json_string(json_str)
-                json_str = re.sub(r'[\x00-\x1F\x7F]', '', json_str)
-                structured_json = json.loads(json_str)
-                for job in structured_json.get("jobs", []):
-                    idx = job.get("index")
-                    if idx is not None and idx < len(indexed_batch):
-                        job["job_link"] = indexed_batch[idx].get("job_link")
-                all_structured_jobs.extend(structured_json.get("jobs", []))
-            except Exception as e:
-                print(f"Failed to parse structured data for batch {batch_num}:", e)
 
-            print(f"Waiting {rate_limit_seconds} seconds before next batch...")
-            time.sleep(rate_limit_seconds)
-
-        # --- Process hiring_cafe jobs with remote-only prompt ---
-        for batch_num, jobs_batch in enumerate(batch_jobs(hiring_cafe_jobs, batch_size), start=1):
-            print(f"Processing batch {batch_num} (hiring_cafe) with {len(jobs_batch)} jobs...")
-
-            indexed_batch = []
-            for idx, job in enumerate(jobs_batch):
-                job_with_index = dict(job)
-                job_with_index["index"] = idx
-                job_with_index["job_hc_id"] = job.get("id")  # Store the hiring cafe job id
-                indexed_batch.append(job_with_index)
-
-            remote_prompt = """
+# hiring_cafe jobs get a remote-only variant of the prompt
+REMOTE_STRUCTURE_PROMPT = """
 You are an expert AI job data structurer and editor. Take a list of raw job postings (as Python dicts) and convert them into a JSON object with a single key 'jobs', whose value is a list of job objects.
 
 For each job:
@@ -428,28 +386,265 @@ Here is the data:
 {indexed_batch}
 Return only a valid JSON string, with no code block, no Python code, and no variable assignment.
 """
-            structured = ask_gemini(remote_prompt)
-            print("Structured data for hiring_cafe batch", batch_num)
-            # print(structured)
 
+# --- LLM Structuring ---
+# Rough characters-per-token ratio used to estimate a prompt's token cost
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000
+
+# Gemini calls retried after a 429 / 503, waiting GEMINI_RETRY_SECONDS * 2**attempt in between
+GEMINI_RETRIES = 4
+GEMINI_RETRY_SECONDS = 10
+
+class LLMRateLimiter:
+    """
+    Global requests-per-minute and tokens-per-minute budget shared by every
+    structuring worker. Each call waits until both budgets allow it.
+    Up to `burst` requests may start at once; the rest of the budget refills evenly,
+    so no 60-second window ever exceeds requests_per_minute / tokens_per_minute.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE, burst=1):
+        burst = min(burst, requests_per_minute / 2)
+        if burst < 1:
+            # Under 2 requests per minute there is no budget to set aside: one at a time
+            self.requests = TokenBucket(requests_per_minute / 60, 1)
+            self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+            return
+        share = burst / requests_per_minute
+        self.requests = TokenBucket((requests_per_minute - burst) / 60, burst)
+        self.tokens = TokenBucket(tokens_per_minute * (1 - share) / 60, tokens_per_minute * share)
+
+    def wait(self, prompt):
+        # The response is a rewrite of the input jobs, so budget roughly twice the prompt
+        self.tokens.wait(2 * len(prompt) // CHARS_PER_TOKEN)
+        self.requests.wait()
+
+def ask_gemini_with_retry(prompt, limiter, retries=GEMINI_RETRIES):
+    """
+    Calls ask_gemini under the rate limiter, retrying with exponential backoff when
+    Gemini answers 429 (quota) or 503 instead of dropping the batch.
+    """
+    for attempt in range(retries + 1):
+        limiter.wait(prompt)
+        try:
+            return ask_gemini(prompt)
+        except (TooManyRequests, ServiceUnavailable) as e:
+            if attempt == retries:
+                raise
+            delay = GEMINI_RETRY_SECONDS * 2 ** attempt
+            print(f"Gemini is throttling ({e.code}), retrying in {delay}s...")
+            time.sleep(delay)
+
+def parse_structured_jobs(structured):
+    json_str = extract_json(structured)
+    json_str = clean_json_string(json_str)
+    json_str = re.sub(r'[\x00-\x1F\x7F]', '', json_str)
+    return json.loads(json_str).get("jobs", [])
+
+def structure_batch(indexed_batch, prompt_template, id_field, limiter):
+    """
+    Sends one indexed batch to Gemini. Returns (groups, unmatched): groups holds one list
+    of structured jobs per entry of indexed_batch, matched through each job's index with
+    `id_field` and `source` copied back from the raw job; unmatched holds jobs with a
+    missing or bad index.
+    """
+    prompt = prompt_template.format(indexed_batch=indexed_batch)
+    groups = [[] for _ in indexed_batch]
+    unmatched = []
+    for job in parse_structured_jobs(ask_gemini_with_retry(prompt, limiter)):
+        idx = job.get("index")
+        if isinstance(idx, int) and 0 <= idx < len(indexed_batch):
+            groups[idx].append(_restore_ids(job, indexed_batch[idx], id_field))
+        else:
+            unmatched.append(job)
+    return groups, unmatched
+
+def structure_batches(batches, limiter, max_in_flight=3, cache=None):
+    """
+    Structures (label, indexed_batch, prompt_template, id_field, cache_keys) batches with up
+    to `max_in_flight` Gemini calls running at once under `limiter`.
+    Returns the structure_batch result for each batch in order, or None for a failed batch.
+    Fully matched batches are stored in `cache` under their raw jobs' keys; raw jobs
+    that produced no structured job are not cached.
+    """
+    results = [None] * len(batches)
+    with ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="structurer") as executor:
+        futures = {
+            executor.submit(structure_batch, indexed_batch, prompt_template, id_field, limiter): i
+            for i, (label, indexed_batch, prompt_template, id_field, cache_keys) in enumerate(batches)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            label, _, _, _, cache_keys = batches[i]
             try:
-                json_str = extract_json(structured)
-                json_str = clean_json_string(json_str)
-                json_str = re.sub(r'[\x00-\x1F\x7F]', '', json_str)
-                structured_json = json.loads(json_str)
-                for job in structured_json.get("jobs", []):
-                    idx = job.get("index")
-                    if idx is not None and idx < len(indexed_batch):
-                        job["job_hc_id"] = indexed_batch[idx].get("job_hc_id")
-                all_structured_jobs.extend(structured_json.get("jobs", []))
+                groups, unmatched = results[i] = future.result()
             except Exception as e:
-                print(f"Failed to parse structured data for hiring_cafe batch {batch_num}:", e)
+                print(f"Failed to parse structured data for {label}:", e)
+                continue
+            print(f"Structured data for {label}: {sum(map(len, groups)) + len(unmatched)} jobs")
+            if cache is not None and not unmatched:
+                for key, group in zip(cache_keys, groups):
+                    # An empty group may just be a posting Gemini skipped; let it be retried
+                    if group:
+                        cache.put(key, group)
+    return results
+
+def hiring_cafe_job_link(job_hc_id):
+    return f"https://hiringcafe.com/{job_hc_id}"
+
+def raw_job_link(job):
+    """
+    The link a raw job will be stored under as Job.job_link.
+    """
+    if job.get("source") == "hiring_cafe" and job.get("id"):
+        return hiring_cafe_job_link(job["id"])
+    return job.get("job_link") or job.get("url") or job.get("link")
+
+def deduplicate_jobs(jobs, known_links=None, seen=None):
+    """
+    Drops raw jobs whose link was already seen in this run or is already stored.
+    `known_links` takes a list of links and returns the ones already saved; it is
+    called once for the whole list. Jobs without a link are kept.
+    """
+    seen = set() if seen is None else seen
+    links = [raw_job_link(job) for job in jobs]
+    known = set(known_links([link for link in links if link])) if known_links else set()
+    unique = []
+    for job, link in zip(jobs, links):
+        if link and (link in seen or link in known):
+            continue
+        if link:
+            seen.add(link)
+        unique.append(job)
+    return unique
+
+def _prepare_raw_job(job):
+    return dict(job, job_link=job.get("job_link") or job.get("url"), source=job.get("source", "other"))
+
+def _prepare_hiring_cafe_job(job):
+    return dict(job, job_hc_id=job.get("id"))  # Store the hiring cafe job id
+
+def _restore_ids(structured, prepared, id_field):
+    # Gemini may drop or rewrite the ids, and a cached job may come from a mirror of this
+    # posting, so always take them from the current raw job
+    job = dict(structured)
+    job[id_field] = prepared[id_field]
+    if "source" in prepared:
+        job["source"] = prepared["source"]
+    return job
+
+# --- Main Scraper Class ---
+class MainScraper:
+    """
+    Scrapes multiple job sites until the last scraped value for each,
+    then enhances/structures the jobs using Gemini LLM.
+    """
+
 
-            print(f"Waiting {rate_limit_seconds} seconds before next batch...")
-            time.sleep(rate_limit_seconds)
+    def scrape_all(self, last_scraped_dict, max_pages=10, batch_size=5, rate_limit_seconds=4, num_jobs=None,
+                   concurrent=True, max_in_flight=3, requests_per_minute=None,
+                   tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE, use_cache=True, known_links=None):
+        """
+        Scrapes all jobs, enhances them with Gemini, and returns structured jobs as a dict.
+        Sources are scraped in parallel unless concurrent=False.
+        Up to max_in_flight Gemini batches run at once; requests_per_minute defaults to
+        one request every rate_limit_seconds.
+        With use_cache=True, postings structured in an earlier run are taken from the
+        structured job cache instead of going back to Gemini.
+        known_links(links) should return the links already stored; those jobs, and
+        repeats within this run, are dropped before structuring.
+        Does NOT save to any file.
+        """
+        # Step 1: Scrape raw jobs from each source
+        sources = {
+            "effoysira": lambda: effoysira_scrape(num_jobs=num_jobs),
+            "ethiojobs": lambda: ethiojobs_scrape(num_jobs=num_jobs),
+            "hamerejobs": lambda: hamerejobs_scrape(num_jobs=num_jobs),
+            "hiring_cafe": lambda: hiring_cafe_scrape(None, max_pages, pages_to_fetch=1)[:num_jobs],
+        }
+        results = scrape_sources(sources, concurrent=concurrent)
+
+        # Separate hiring_cafe jobs for special processing
+        hiring_cafe_jobs = results.pop("hiring_cafe", [])
+        # Combine all other jobs into one flat list
+        raw_jobs = []
+        for jobs in results.values():
+            if isinstance(jobs, list):
+                for job in jobs:
+                    if isinstance(job, list):
+                        raw_jobs.extend(job)
+                    else:
+                        raw_jobs.append(job)
+            else:
+                raw_jobs.append(jobs)
+        print(f"Total jobs scraped (excluding hiring_cafe): {len(raw_jobs)}")
+        print(f"Total hiring_cafe jobs scraped: {len(hiring_cafe_jobs)}")
+
+        # Only new postings go on to structuring
+        seen = set()
+        raw_jobs = deduplicate_jobs(raw_jobs, known_links, seen)
+        hiring_cafe_jobs = deduplicate_jobs(hiring_cafe_jobs, known_links, seen)
+        print(f"New jobs after deduplication: {len(raw_jobs)} (excluding hiring_cafe), {len(hiring_cafe_jobs)} (hiring_cafe)")
+
+        # Step 2: Reuse cached structuring for postings seen before, batch the rest.
+        # slots keeps one entry per raw job so the output stays in scrape order.
+        cache = get_structured_cache() if use_cache and LLM_CACHE_ENABLED else None
+        slots = []
+        batches = []
+        batch_slots = []
+        groups = (
+            ("batch", raw_jobs, STRUCTURE_PROMPT, "job_link", _prepare_raw_job),
+            # hiring_cafe jobs use the remote-only prompt
+            ("hiring_cafe batch", hiring_cafe_jobs, REMOTE_STRUCTURE_PROMPT, "job_hc_id", _prepare_hiring_cafe_job),
+        )
+        for label, jobs, prompt_template, id_field, prepare in groups:
+            pending = []
+            for job in jobs:
+                prepared = prepare(job)
+                key = structured_cache_key(job, prompt_template) if cache else None
+                cached = cache.get(key) if cache else None
+                if cached is not None:
+                    slots.append([_restore_ids(structured, prepared, id_field) for structured in cached])
+                else:
+                    slots.append(None)
+                    pending.append((len(slots) - 1, prepared, key))
+
+            # The index maps each structured job back to its raw job
+            for batch_num, jobs_batch in enumerate(batch_jobs(pending, batch_size), start=1):
+                indexed_batch = [dict(prepared, index=idx) for idx, (_, prepared, _) in enumerate(jobs_batch)]
+                keys = [key for _, _, key in jobs_batch]
+                batches.append((f"{label} {batch_num}", indexed_batch, prompt_template, id_field, keys))
+                batch_slots.append([slot for slot, _, _ in jobs_batch])
+
+        if cache is not None:
+            print(f"Structured job cache: {cache.hits} hits, {cache.misses} misses")
+
+        # Step 3: Structure all batches concurrently under the global rate limit
+        if requests_per_minute is None:
+            requests_per_minute = 60 / rate_limit_seconds if rate_limit_seconds else 60
+        limiter = LLMRateLimiter(requests_per_minute, tokens_per_minute, burst=max_in_flight)
+        print(f"Structuring {len(batches)} batches with up to {max_in_flight} in flight...")
+        results = structure_batches(batches, limiter, max_in_flight=max_in_flight, cache=cache)
+        for positions, result in zip(batch_slots, results):
+            if result is None:
+                continue
+            batch_groups, unmatched = result
+            for slot, group in zip(positions, batch_groups):
+                slots[slot] = group
+            slots[positions[-1]] = slots[positions[-1]] + unmatched
+
+        all_structured_jobs = [job for slot in slots if slot for job in slot]
+
+        if cache is not None:
+            cache.evict()
+            print("Structured job cache stats:", cache.stats())
+        if HTTP_CACHE_ENABLED:
+            print(f"Evicted {get_page_cache().evict()} cached pages.")
 
         return {"jobs": all_structured_jobs}
 
+
 # --- Example Usage ---
 if __name__ == "__main__":
     load_dotenv()
@@ -0,0 +1,34 @@
+import os
+from bs4 import BeautifulSoup
+
+# BeautifulSoup tree builders the scrapers can run on, fastest first.
+PARSER_BACKENDS = ("lxml", "html.parser", "html5lib")
+
+def _default_parser():
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+_parser = os.getenv("SCRAPER_HTML_PARSER") or _default_parser()
+
+def get_parser():
+    return _parser
+
+def set_parser(name):
+    """
+    Switches the tree builder used by make_soup, e.g. "lxml" or "html.parser".
+    """
+    global _parser
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name}")
+    _parser = name
+
+def make_soup(html):
+    """
+    Builds a BeautifulSoup tree with the configured backend (lxml when installed).
+    All scraper parse functions go through here, so their signatures and outputs
+    stay the same whichever backend is selected.
+    """
+    return BeautifulSoup(html, _parser)
@@ -0,0 +1,61 @@
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Requests per second allowed against a single domain, and how many can be sent in a burst.
+DEFAULT_RATE_PER_DOMAIN = float(os.getenv("SCRAPER_RATE_PER_DOMAIN", "1"))
+DEFAULT_BURST = int(os.getenv("SCRAPER_BURST", "2"))
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Tokens refill at `rate` per second up to `capacity`.
+    Callers reserve a token and wait out any deficit, so waiting works the same from
+    plain threads (wait) and from any asyncio event loop (acquire).
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount=1):
+        """
+        Takes `amount` tokens and returns how many seconds the caller must wait before using them.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def wait(self, amount=1):
+        delay = self.reserve(amount)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire(self, amount=1):
+        delay = self.reserve(amount)
+        if delay:
+            await asyncio.sleep(delay)
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+def get_domain_bucket(url, rate=None, burst=None):
+    """
+    Returns the shared token bucket for the domain of `url`, creating it on first use.
+    """
+    domain = urlsplit(url).netloc or url
+    with _buckets_lock:
+        bucket = _buckets.get(domain)
+        if bucket is None:
+            bucket = TokenBucket(rate or DEFAULT_RATE_PER_DOMAIN, burst or DEFAULT_BURST)
+            _buckets[domain] = bucket
+        return bucket
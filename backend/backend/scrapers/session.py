@@ -0,0 +1,67 @@
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+# Default number of keep-alive connections kept open per host.
+DEFAULT_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "10"))
+# Seconds to wait for a connection / response before giving up.
+REQUEST_TIMEOUT = float(os.getenv("SCRAPER_REQUEST_TIMEOUT", "30"))
+
+# Per-host overrides, e.g. {"hiring.cafe": 4}
+POOL_SIZES = {}
+
+_session = None
+_lock = threading.Lock()
+
+def _make_adapter(pool_size):
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=None,  # also retry the hiring.cafe POST
+    )
+    return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+def _mount_host(session, host, pool_size):
+    for scheme in ("https://", "http://"):
+        session.mount(f"{scheme}{host}", _make_adapter(pool_size))
+
+def get_session():
+    """
+    Returns the process-wide requests.Session shared by all scrapers.
+    Connections are pooled and kept alive per host, and responses are requested
+    compressed (gzip/deflate, plus brotli when the brotli package is installed).
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(make_headers(accept_encoding=True))
+                adapter = _make_adapter(DEFAULT_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                for host, pool_size in POOL_SIZES.items():
+                    _mount_host(session, host, pool_size)
+                _session = session
+    return _session
+
+def set_pool_size(host_or_url, pool_size):
+    """
+    Sets the connection pool size for a single host. Accepts a bare host name or a URL.
+    """
+    host = urlsplit(host_or_url).netloc or host_or_url
+    POOL_SIZES[host] = pool_size
+    if _session is not None:
+        _mount_host(_session, host, pool_size)
+
+def close_session():
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None